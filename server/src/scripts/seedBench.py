@@ -0,0 +1,136 @@
+"""Benchmark seedDB.py generation throughput and memory at several scales.
+
+Every scale point runs in a fresh process, so its peak RSS is its own. For
+each point the report records rows/sec and wall time per model phase and the
+peak memory of the run, and is written as JSON so runs can be compared:
+
+    python seedBench.py --output bench.json
+    python seedBench.py --points 1000 10000 --output new.json --compare bench.json
+"""
+import argparse
+import json
+import platform
+import resource
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import seedDB
+
+DEFAULT_POINTS = [1_000, 10_000, 100_000, 1_000_000]
+
+# Share of the rows per large table that each model gets at a scale point
+SCALE_SHARES = {
+    "Registration": 1, "Result": 1, "Notification": 1, "Log": 1,
+    "Student": 1 / 10, "User": 1 / 10,
+    "Staff": 1 / 100, "Course": 1 / 100,
+}
+
+
+def point_counts(rows):
+    return {model: max(1, int(rows * share)) for model, share in SCALE_SHARES.items()}
+
+
+def peak_rss_mb(who=resource.RUSAGE_SELF):
+    # ru_maxrss is in KiB on Linux but in bytes on macOS
+    peak = resource.getrusage(who).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def run_point(rows, seed, workers=1, vectorized=False, serialize=False, trace=False, snapshot=seedDB.SAMPLE_SNAPSHOT,
+              distribution="uniform"):
+    """Generate one scale point and return its measurements."""
+    existing_data = seedDB.load_snapshot(snapshot)
+    counts = point_counts(rows)
+    profiler = seedDB.PhaseProfiler(trace_phase="*" if trace else None)
+    tables = seedDB.iter_filler_data(existing_data, counts, workers, seed, vectorized, distribution=distribution)
+    for _, model_rows in profiler.wrap(tables):
+        for row in model_rows:
+            if serialize:
+                seedDB.dump_row(row)
+
+    summary = profiler.summary()
+    return {
+        "rows": rows,
+        "counts": counts,
+        "wallTime": round(summary["wallSeconds"], 3),
+        "cpuTime": round(summary["cpuSeconds"], 3),
+        "peakRssMb": peak_rss_mb(),
+        "peakWorkerRssMb": peak_rss_mb(resource.RUSAGE_CHILDREN),
+        "phases": summary["phases"],
+    }
+
+
+def compare(report, baseline, max_regression):
+    """Print per-phase throughput changes against ``baseline`` and return the regressions found."""
+    baseline_phases = {
+        (point["rows"], phase["model"]): phase
+        for point in baseline["points"] for phase in point["phases"]
+    }
+    regressions = []
+    for point in report["points"]:
+        for phase in point["phases"]:
+            before = baseline_phases.get((point["rows"], phase["model"]))
+            if not before or not before["rowsPerSec"] or not phase["rowsPerSec"] or phase["rows"] < 1000:
+                continue  # Too few rows to time reliably
+            change = phase["rowsPerSec"] / before["rowsPerSec"] - 1
+            print(f"{point['rows']:>9} {phase['model']:<16} {before['rowsPerSec']:>10} -> {phase['rowsPerSec']:>10} rows/s ({change:+.0%})")
+            if change < -max_regression:
+                regressions.append((point["rows"], phase["model"], change))
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark seedDB.py generation at several scales.")
+    parser.add_argument("--points", type=int, nargs="+", default=DEFAULT_POINTS,
+                        help="Rows per large table (Registration, Result, Notification, Log) at each scale point")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the generated datasets")
+    parser.add_argument("--workers", type=int, default=1, help="Processes for the sharded tables")
+    parser.add_argument("--numpy", action="store_true", help="Use the NumPy generation path")
+    parser.add_argument("--distribution", choices=list(seedDB.DISTRIBUTION_PROFILES), default="uniform",
+                        help="Distribution profile of the generated values")
+    parser.add_argument("--serialize", action="store_true", help="Include JSON serialization of every row in the timings")
+    parser.add_argument("--tracemalloc", action="store_true", help="Also record the peak traced memory of each phase (slower)")
+    parser.add_argument("--snapshot", default=seedDB.SAMPLE_SNAPSHOT,
+                        help="db_backup.json snapshot to generate against (default: sample_db_backup.json)")
+    parser.add_argument("--output", default="seed_bench.json", help="File to write the JSON report to")
+    parser.add_argument("--compare", metavar="BASELINE", help="Report written by an earlier run to compare against")
+    parser.add_argument("--max-regression", type=float, default=0.2,
+                        help="Largest accepted throughput drop per phase when comparing, as a fraction")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "workers": args.workers,
+        "numpy": args.numpy,
+        "distribution": args.distribution,
+        "serialize": args.serialize,
+        "points": [],
+    }
+    for rows in args.points:
+        # A fresh process per point, so peak RSS is not carried over from a larger point
+        with ProcessPoolExecutor(1) as pool:
+            point = pool.submit(run_point, rows, args.seed, args.workers, args.numpy,
+                                args.serialize, args.tracemalloc, args.snapshot, args.distribution).result()
+        report["points"].append(point)
+        print(f"{rows:>9} rows: {point['wallTime']}s, peak RSS {point['peakRssMb']} MB")
+
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Benchmark report saved to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(report, json.load(f), args.max_regression)
+        if regressions:
+            for rows, model, change in regressions:
+                print(f"Regression: {model} at {rows} rows is {-change:.0%} slower")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
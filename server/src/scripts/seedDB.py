@@ -1,687 +1,2819 @@
+import argparse
+from array import array
+from bisect import bisect_left, bisect_right
+import codecs
+import csv
+from collections import Counter, deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+import cProfile
+import hashlib
+from itertools import chain, islice, repeat
+from math import isqrt, log, log1p, prod
 import json
-from datetime import datetime
+import mmap
+import os
+import pickle
+import pstats
+import re
+import shutil
+import sys
+from datetime import date, datetime
 import random
+import time
+import tracemalloc
 
-def generate_filler_data(existing_data):
-    filler_data = {}
-
-    # Helper function to generate a random date within a reasonable range
-    def random_date(start_year=2023, end_year=2025):
-        year = random.randint(start_year, end_year)
-        month = random.randint(1, 12)
-        day = random.randint(1, 28)  # Keep it simple to avoid month-end issues
-        hour = random.randint(0, 23)
-        minute = random.randint(0, 59)
-        second = random.randint(0, 59)
-        return datetime(year, month, day, hour, minute, second).isoformat() + "Z"
-
-    # Helper function to get a random element from a list
-    def get_random(data_list):
-        return random.choice(data_list) if data_list else None
-
-    # Helper function to generate a unique ID (simple incrementing based on existing)
-    def generate_unique_id(table_name, data):
-        if table_name in data and data[table_name]:
-            max_numeric_id = 0
-            processed_any_valid_id = False
-
-            for item in data[table_name]:
-                current_id_val = item.get('id')
-                item_numeric_id = None # Stores the extracted numeric part of the ID
-
-                if isinstance(current_id_val, int):
-                    item_numeric_id = current_id_val
-                elif isinstance(current_id_val, str):
-                    # Specific parsing for "Registration" table's "REG<number>" format
-                    if table_name == "Registration" and current_id_val.startswith("REG"):
-                        try:
-                            # Extract numeric part after "REG"
-                            item_numeric_id = int(current_id_val[3:])
-                        except ValueError:
-                            # Failed to parse numeric part, item_numeric_id remains None
-                            pass
-                    # Add other 'elif' clauses here if other tables use specific string ID formats
-                    # that need parsing to extract a numeric component. For example:
-                    # elif table_name == "SomeOtherTable" and current_id_val.startswith("PFX"):
-                    #     try:
-                    #         item_numeric_id = int(current_id_val[len("PFX"):])
-                    #     except ValueError:
-                    #         pass
-                    else:
-                        # Fallback for strings that might be plain numbers (e.g., "123")
-                        try:
-                            item_numeric_id = int(current_id_val)
-                        except ValueError:
-                            # String is not a simple number, item_numeric_id remains None
-                            pass
-                
-                if item_numeric_id is not None:
-                    if not processed_any_valid_id or item_numeric_id > max_numeric_id:
-                        max_numeric_id = item_numeric_id
-                    processed_any_valid_id = True
-            
-            if processed_any_valid_id:
-                return max_numeric_id + 1
-            # If no processable numeric IDs were found in data[table_name] (e.g., table has items 
-            # but IDs are all non-numeric strings or 'id' key is missing), 
-            # fall through to NextId logic or default.
-
-        elif "NextId" in existing_data:
-            for next_id_entry in existing_data["NextId"]:
-                if next_id_entry["tableName"].lower() == table_name.lower():
-                    next_id = next_id_entry.get("nextId", 1)
-                    next_id_entry["nextId"] += 1 # Simulate ID increment
-                    return next_id
-        return 1
-
-    # Helper function to generate a unique code
-    def generate_unique_code(prefix, existing_codes):
-        count = 1
+try:
+    import numpy as np
+except ImportError:  # Only needed for the vectorized generation path
+    np = None
+
+try:
+    import bcrypt
+except ImportError:  # Only needed to hash the passwords of a PasswordPool
+    bcrypt = None
+
+# String ID formats that carry a numeric part after a fixed prefix, per table,
+# and the number of digits of the numeric part (5 by default). Generated
+# RegistrationEntry IDs have the length of the cuid() IDs Prisma gives them.
+ID_PREFIXES = {
+    "RegistrationEntry": "c",
+}
+ID_WIDTHS = {
+    "RegistrationEntry": 24,
+}
+
+# Snapshot the generator runs against when none is given, in the db_backup.json layout
+SAMPLE_SNAPSHOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sample_db_backup.json")
+
+# Password hash of generated users, which no password matches, unless a
+# PasswordPool gives them real ones. The server hashes with bcryptjs at cost 10.
+PLACEHOLDER_PASSWORD = "$2a$10$fakehashedpassword"
+BCRYPT_COST = 10
+# The pool holds plaintext passwords, so it is cached in the user's cache
+# directory rather than next to the script, out of the source tree
+PASSWORD_CACHE = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+                              "school-seed", "password_pool.json")
+
+# Columns of the snapshot rows the generator reads, for the models whose rows it
+# only looks up. Models listed with None are small and kept whole, since the
+# generator rewrites them; models not listed are skipped.
+SNAPSHOT_COLUMNS = {
+    "Staff": ("id", "staffId", "position", "departmentId"),
+    "Student": ("id", "studentId", "departmentId", "createdAt"),
+    "Course": ("id", "code", "credits", "departmentId", "yearLevel", "semester"),
+    "User": ("id", "email", "studentId", "staffId"),
+    "Registration": ("id", "studentId", "academicSessionId", "semesterId"),
+    "RegistrationEntry": ("id",),
+    "AllowedCourseEntry": ("id", "allowedCoursesId", "courseId"),
+    "Result": ("id", "studentId", "courseId", "academicSessionId", "semesterId"),
+    "Notification": ("id",),
+    "Log": ("id", "createdAt"),
+    "HOD": None,
+    "NextId": None,
+    "AllowedCourses": None,
+    "Department": None,
+    "Dean": None,
+    "Semester": None,
+    "Faculty": None,
+    "SchoolSetting": None,
+    "AcademicSession": None,
+}
+
+SNAPSHOT_CHUNK_SIZE = 1 << 20
+
+SCHEMA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "prisma", "schema.prisma")
+
+# Disk space the datasets cached by a DatasetCache may take before the least
+# recently used ones are evicted
+DATASET_CACHE_MB = 2048
+
+# Number of rows generated per model, by scale profile. Registrations stay
+# within one per student and semester, of which the sample snapshot has six.
+SCALE_PROFILES = {
+    "default": {
+        "Staff": 3, "Student": 2, "Course": 5, "Registration": 10, "Result": 15,
+        "Notification": 3, "User": 2, "Log": 5,
+    },
+    "small": {
+        "Staff": 100, "Student": 1_000, "Course": 200, "Registration": 4_000, "Result": 10_000,
+        "Notification": 500, "User": 1_000, "Log": 5_000,
+    },
+    "medium": {
+        "Staff": 500, "Student": 10_000, "Course": 1_000, "Registration": 40_000, "Result": 200_000,
+        "Notification": 10_000, "User": 10_000, "Log": 100_000,
+    },
+    "university": {
+        "Staff": 2_000, "Student": 50_000, "Course": 5_000, "Registration": 250_000, "Result": 2_000_000,
+        "Notification": 100_000, "User": 52_000, "Log": 1_000_000,
+    },
+}
+
+
+def resolve_counts(scale="default", overrides=None):
+    """Return the per-model row counts for ``scale`` with ``overrides`` applied."""
+    if scale not in SCALE_PROFILES:
+        raise ValueError(f"Unknown scale profile '{scale}', expected one of {sorted(SCALE_PROFILES)}")
+    counts = dict(SCALE_PROFILES[scale])
+    for model, rows in (overrides or {}).items():
+        if model not in counts:
+            raise ValueError(f"Row count for '{model}' is not configurable, expected one of {sorted(counts)}")
+        if rows < 0:
+            raise ValueError(f"Row count for '{model}' must not be negative")
+        counts[model] = rows
+    return counts
+
+# Shape of the generated values, by distribution profile. "uniform" draws every
+# value uniformly, as the generator always did. "production" reproduces the hot
+# spots of a live school database:
+# - department_skew: Zipf exponent of department sizes, for staff, students and courses
+# - course_skew: Zipf exponent of course popularity within the courses a student may take
+# - recency: how much likelier each year is than the one before it, for dates
+# - grade_curve: mean and standard deviation of the normally distributed scores,
+#   with grades following from the scores; None for uniform scores and grades
+DISTRIBUTION_PROFILES = {
+    "uniform": {"department_skew": 0, "course_skew": 0, "recency": 0, "grade_curve": None},
+    "production": {"department_skew": 1.1, "course_skew": 1.2, "recency": 1.5, "grade_curve": (62, 14)},
+}
+
+# Rows per shard of the tables that can be generated across processes
+SHARD_ROWS = 50_000
+
+
+def new_seed():
+    return random.SystemRandom().randrange(2 ** 32)
+
+
+def table_rng(seed, table_name):
+    """Return the random stream of ``table_name`` for the dataset ``seed``.
+
+    Each table draws from its own stream, so changing how many rows one table
+    gets does not shift the random values of any other table.
+    """
+    digest = hashlib.sha256(f"{seed}:{table_name}".encode()).digest()
+    return random.Random(int.from_bytes(digest[:8], "big"))
+
+
+def recent_year(start_year, end_year, rng, recency):
+    """Draw a year in ``start_year..end_year``, each ``1 + recency`` times as likely as the one before."""
+    ratio = 1 + recency
+    year = start_year + int(log1p(rng.random() * (ratio ** (end_year - start_year + 1) - 1)) / log(ratio))
+    return min(year, end_year)
+
+
+# Helper function to generate a random date within a reasonable range
+def random_date(start_year=2023, end_year=2025, rng=random, recency=0):
+    year = recent_year(start_year, end_year, rng, recency) if recency else rng.randint(start_year, end_year)
+    month = rng.randint(1, 12)
+    day = rng.randint(1, 28)  # Keep it simple to avoid month-end issues
+    hour = rng.randint(0, 23)
+    minute = rng.randint(0, 59)
+    second = rng.randint(0, 59)
+    return datetime(year, month, day, hour, minute, second).isoformat() + "Z"
+
+
+EPOCH = datetime(1970, 1, 1)
+EPOCH_ORDINAL = EPOCH.toordinal()
+
+
+def random_timestamp(start_year=2023, end_year=2025, rng=random, recency=0):
+    """``random_date`` as seconds since the epoch, drawing the same random values."""
+    year = recent_year(start_year, end_year, rng, recency) if recency else rng.randint(start_year, end_year)
+    month = rng.randint(1, 12)
+    day = rng.randint(1, 28)
+    hour = rng.randint(0, 23)
+    minute = rng.randint(0, 59)
+    second = rng.randint(0, 59)
+    return (date(year, month, day).toordinal() - EPOCH_ORDINAL) * 86400 + hour * 3600 + minute * 60 + second
+
+
+# Pieces of the timestamps format_timestamp writes: the ISO dates seen so far, by
+# days since the epoch, and every "THH:MM" and ":SSZ"
+_day_strings = {}
+_minute_strings = [f"T{minute // 60:02d}:{minute % 60:02d}" for minute in range(24 * 60)]
+_second_strings = [f":{second:02d}Z" for second in range(60)]
+
+
+def format_timestamp(timestamp):
+    """Format seconds since the epoch the way ``random_date`` does."""
+    days, seconds = divmod(timestamp, 86400)
+    day = _day_strings.get(days)
+    if day is None:
+        day = _day_strings[days] = date.fromordinal(EPOCH_ORDINAL + days).isoformat()
+    minutes, seconds = divmod(seconds, 60)
+    return day + _minute_strings[minutes] + _second_strings[seconds]
+
+
+def parse_timestamp(value):
+    """Seconds since the epoch of an ISO date written by the server or ``random_date``, or None."""
+    try:
+        return int((datetime.fromisoformat(str(value).rstrip("Z")) - EPOCH).total_seconds())
+    except ValueError:
+        return None
+
+
+# Helper function to get a random element from a list
+def get_random(data_list, rng=random):
+    return rng.choice(data_list) if data_list else None
+
+
+def zipf_weights(count, exponent):
+    """Cumulative Zipf weights of ``count`` ranks, or None when ``exponent`` makes them uniform."""
+    if not exponent or not count:
+        return None
+    total, weights = 0.0, []
+    for rank in range(1, count + 1):
+        total += rank ** -exponent
+        weights.append(total)
+    return weights
+
+
+def get_weighted(data_list, cum_weights, rng=random):
+    """``get_random`` with the given cumulative weights; uniform (and the same draw) without any."""
+    if cum_weights is None or not data_list:
+        return get_random(data_list, rng)
+    return data_list[bisect_right(cum_weights, rng.random() * cum_weights[-1])]
+
+
+# Helper function to remove and return a random element from a list, in O(1)
+def take_random(data_list, rng=random):
+    if not data_list:
+        return None
+    index = rng.randrange(len(data_list))
+    data_list[index], data_list[-1] = data_list[-1], data_list[index]
+    return data_list.pop()
+
+
+def format_id(table_name, numeric_id, width=None):
+    prefix = ID_PREFIXES.get(table_name)
+    if not prefix:
+        return numeric_id
+    return f"{prefix}{numeric_id:0{width or ID_WIDTHS.get(table_name, 5)}d}"
+
+
+def parse_numeric_id(table_name, value):
+    """Return the numeric part of an ID of ``table_name``, or None if it has none."""
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str):
+        prefix = ID_PREFIXES.get(table_name)
+        if prefix and value.startswith(prefix):
+            value = value[len(prefix):]
+        try:
+            return int(value)
+        except ValueError:
+            return None
+    return None
+
+# Lookups made by the ID, code and relation allocators, read per phase by PhaseProfiler
+PROBES = Counter()
+
+# Foreign key columns whose values are indexed, per model, for "is it already referenced" lookups
+INDEXED_FOREIGN_KEYS = {
+    "HOD": ["staffId", "departmentId"],
+    "Department": ["facultyId", "hodId", "name"],
+    "Dean": ["staffId", "facultyId"],
+    "User": ["studentId", "staffId"],
+}
+
+
+class RelationIndex:
+    """Sets of the values taken by the indexed foreign key columns of each model.
+
+    Built once from the existing rows of a model and updated with every row
+    added after that, so checking whether a row is already referenced is O(1).
+    """
+
+    def __init__(self):
+        self.values = {}
+
+    def add(self, model, rows):
+        for column in INDEXED_FOREIGN_KEYS.get(model, []):
+            self.values.setdefault((model, column), set()).update(row.get(column) for row in rows)
+
+    def references(self, model, column, value):
+        PROBES["relationLookups"] += 1
+        return value in self.values.get((model, column), ())
+
+# Smallest zero-padding width of generated codes, per code column; the server
+# pads staff and student numbers to 5 digits (padToTenThousands)
+CODE_WIDTHS = {
+    "Staff.staffId": 5,
+    "Student.studentId": 5,
+}
+DEFAULT_CODE_WIDTH = 3
+
+
+def code_width(column, max_codes):
+    """Return the padding width for ``column`` that fits ``max_codes`` codes per prefix."""
+    return max(CODE_WIDTHS.get(column, DEFAULT_CODE_WIDTH), len(str(max_codes)))
+
+
+class CodeSequencer:
+    """Hands out unique ``<prefix><number>`` codes, keeping a counter per prefix.
+
+    Codes that are already taken are skipped. The counters only move forward,
+    so generating K codes costs O(K + taken codes) overall.
+    """
+
+    def __init__(self, taken_codes=(), width=DEFAULT_CODE_WIDTH):
+        self.taken = set(taken_codes)
+        self.width = width
+        self.counters = {}
+
+    def next_code(self, prefix):
+        count = self.counters.get(prefix, 0)
+        PROBES["codesIssued"] += 1
         while True:
-            code = f"{prefix}{count:03d}"
-            if code not in existing_codes:
-                return code
+            PROBES["codeProbes"] += 1
             count += 1
+            if count >= 10 ** self.width:
+                raise ValueError(f"Ran out of {self.width}-digit codes for prefix '{prefix}'")
+            code = f"{prefix}{count:0{self.width}d}"
+            if code not in self.taken:
+                break
+        self.counters[prefix] = count
+        self.taken.add(code)
+        return code
 
-    # --- Generate filler data for each model ---
-
-    # Course
-    filler_data["Course"] = list(existing_data.get("Course", []))
-    department_ids = [dept["id"] for dept in existing_data.get("Department", [])]
-    staff_ids = [staff["id"] for staff in existing_data.get("Staff", []) if staff.get("position") in ["professor", "doctor", "lecturer"]]
-    existing_course_codes = {course["code"] for course in filler_data["Course"]}
-    for _ in range(5): # Generate 5 more courses
-        new_course = {
-            "id": generate_unique_id("Course", filler_data),
-            "name": f"Advanced {get_random(['Mathematics', 'Physics', 'Chemistry', 'Biology', 'History'])}",
-            "code": generate_unique_code(get_random(['MATH', 'PHY', 'CHEM', 'BIO', 'HIST']), existing_course_codes),
-            "credits": random.randint(2, 4),
-            "departmentId": get_random(department_ids),
-            "lecturerId": get_random(staff_ids),
-            "createdAt": random_date(),
-            "isDeleted": 0
-        }
-        filler_data["Course"].append(new_course)
-        existing_course_codes.add(new_course["code"])
-
-    # Registration
-    filler_data["Registration"] = list(existing_data.get("Registration", []))
-    student_ids = [stu["id"] for stu in existing_data.get("Student", [])]
-    course_ids = [course["id"] for course in filler_data["Course"]]
-    academic_session_ids = [session["id"] for session in existing_data.get("AcademicSession", [])]
-    semester_ids = [semester["id"] for semester in existing_data.get("Semester", [])]
-    for _ in range(10): # Generate 10 registrations
-        student_id = get_random(student_ids)
-        if student_id:
-            filler_data["Registration"].append({
-                "id": f"REG{generate_unique_id('Registration', filler_data):05d}",
-                "studentId": student_id,
-                "courses": [get_random(course_ids)],
-                "academicSessionId": get_random(academic_session_ids),
-                "semesterId": get_random(semester_ids),
-                "createdAt": random_date(),
-                "updatedAt": random_date()
-            })
+    def last_number(self, prefix):
+        """Return the number of the last code handed out for ``prefix``, or 0."""
+        return self.counters.get(prefix, 0)
 
-    # HOD (Keep existing, maybe add one more if departments are lacking)
-    filler_data["HOD"] = list(existing_data.get("HOD", []))
-    existing_hod_dept_ids = {hod["departmentId"] for hod in filler_data["HOD"]}
-    available_staff_for_hod = [staff["id"] for staff in existing_data.get("Staff", []) if staff.get("position") in ["professor", "doctor", "lecturer"] and staff["departmentId"] not in existing_hod_dept_ids]
-    available_departments_for_hod = [dept["id"] for dept in existing_data.get("Department", []) if dept["id"] not in existing_hod_dept_ids]
-    if available_staff_for_hod and available_departments_for_hod:
-        filler_data["HOD"].append({
-            "id": generate_unique_id("HOD", filler_data),
-            "staffId": get_random(available_staff_for_hod),
-            "departmentId": get_random(available_departments_for_hod),
-            "isDeleted": 0
-        })
 
-    # NextId (Keep existing - the generate_unique_id function updates it)
-    filler_data["NextId"] = list(existing_data.get("NextId", []))
-    next_id_map = {item["tableName"].lower(): item for item in filler_data["NextId"]}
-    for table_name in ["staff", "student", "course", "registration", "hod", "department", "dean", "result", "semester", "notification", "faculty", "schoolsetting", "academicsession", "user", "log"]:
-        if table_name not in next_id_map:
-            filler_data["NextId"].append({"id": generate_unique_id("NextId", filler_data), "tableName": table_name.capitalize(), "nextId": 1})
-
-    # Staff
-    filler_data["Staff"] = list(existing_data.get("Staff", []))
-    department_ids = [dept["id"] for dept in existing_data.get("Department", [])]
-    existing_staff_ids = {staff["staffId"] for staff in filler_data["Staff"]}
-    staff_positions = ["lecturer", "assistant", "professor", "doctor"]
-    for _ in range(3): # Generate 3 more staff members
-        first_name = get_random(["Alice", "Bob", "Charlie", "David", "Eve"])
-        last_name = get_random(["Smith", "Jones", "Williams", "Brown", "Davis"])
-        staff_id = generate_unique_code("STAFF", existing_staff_ids)
-        filler_data["Staff"].append({
-            "id": generate_unique_id("Staff", filler_data),
-            "userId": None,
-            "staffId": staff_id,
-            "firstName": first_name,
-            "lastName": last_name,
-            "position": get_random(staff_positions),
-            "departmentId": get_random(department_ids),
-            "createdAt": random_date(),
-            "isDeleted": 0
-        })
-        existing_staff_ids.add(staff_id)
-
-    # Department (Keep existing, maybe add one more if faculties are lacking)
-    filler_data["Department"] = list(existing_data.get("Department", []))
-    faculty_ids = [fac["id"] for fac in existing_data.get("Faculty", [])]
-    existing_dept_codes = {dept["code"] for dept in filler_data["Department"]}
-    available_hod_dept_ids = {hod["departmentId"] for hod in filler_data["HOD"]}
-    available_faculties_for_dept = [fac_id for fac_id in faculty_ids if not any(dept["facultyId"] == fac_id for dept in filler_data["Department"])]
-    if available_faculties_for_dept:
-        filler_data["Department"].append({
-            "id": generate_unique_id("Department", filler_data),
-            "name": f"New {get_random(['Engineering', 'Science', 'Arts'])} Department",
-            "code": generate_unique_code(get_random(['ENG', 'SCI', 'ART']), existing_dept_codes),
-            "hodId": get_random([hod["staffId"] for hod in filler_data["HOD"]]),
-            "facultyId": get_random(available_faculties_for_dept),
-            "isDeleted": 0
-        })
+class IdAllocator:
+    """Hands out incrementing numeric IDs per table.
 
-    # Dean (Keep existing, maybe add one more if staff are available)
-    filler_data["Dean"] = list(existing_data.get("Dean", []))
-    available_staff_for_dean = [staff["id"] for staff in existing_data.get("Staff", []) if staff.get("position") == "professor" and not any(dean["staffId"] == staff["id"] for dean in filler_data["Dean"])]
-    available_faculty_for_dean = [fac["id"] for fac in existing_data.get("Faculty", []) if not any(dean["facultyId"] == fac["id"] for dean in filler_data["Dean"])]
-    if available_staff_for_dean and available_faculty_for_dean:
-        filler_data["Dean"].append({
-            "id": generate_unique_id("Dean", filler_data),
-            "staffId": get_random(available_staff_for_dean),
-            "facultyId": get_random(available_faculty_for_dean),
-            "isDeleted": 0
+    Each table is scanned once, on the first request for one of its IDs, to
+    find its high-water mark; every later ID is handed out in O(1). Tables
+    without any usable ID fall back to their ``NextId`` entry, which is kept
+    in step with the IDs handed out.
+    """
+
+    def __init__(self, data, next_id_entries=()):
+        self.data = data
+        self.high_water = {}
+        self.next_id_entries = {entry["tableName"].lower(): entry for entry in next_id_entries}
+        self.next_id_tables = set()
+
+    def _scan(self, table_name):
+        max_numeric_id = None
+        for item in self.data.get(table_name) or []:
+            PROBES["idScanRows"] += 1
+            item_numeric_id = parse_numeric_id(table_name, item.get("id"))
+            if item_numeric_id is not None and (max_numeric_id is None or item_numeric_id > max_numeric_id):
+                max_numeric_id = item_numeric_id
+        if max_numeric_id is not None:
+            return max_numeric_id
+
+        # No processable numeric IDs in the table: continue from NextId, if any
+        next_id_entry = self.next_id_entries.get(table_name.lower())
+        if next_id_entry is not None:
+            self.next_id_tables.add(table_name)
+            return next_id_entry.get("nextId", 1) - 1
+        return 0
+
+    def reserve(self, table_name, count):
+        """Reserve ``count`` consecutive IDs of ``table_name`` and return the first one."""
+        PROBES["idReservations"] += 1
+        if table_name not in self.high_water:
+            self.high_water[table_name] = self._scan(table_name)
+        first_id = self.high_water[table_name] + 1
+        self.high_water[table_name] += count
+        if table_name in self.next_id_tables:
+            self.next_id_entries[table_name.lower()]["nextId"] = self.high_water[table_name] + 1
+        return first_id
+
+    def next_id(self, table_name):
+        return self.reserve(table_name, 1)
+
+
+class KeyPermutation:
+    """A seeded pseudo-random permutation of ``range(size)``, evaluated one value at a time.
+
+    A Feistel network with modular addition shuffles the ``side * side``
+    square covering ``size``, and values landing outside ``range(size)``
+    are fed through again (cycle walking) until they fall inside, which the
+    square keeps rare. It is a bijection, so distinct positions always give
+    distinct values, and it is invertible.
+    """
+
+    ROUNDS = 4
+    MULTIPLIER = 0x9E3779B97F4A7C15
+    MASK64 = (1 << 64) - 1
+
+    def __init__(self, size, seed):
+        self.size = size
+        self.side = isqrt(max(size, 1) - 1) + 1
+        rng = random.Random(seed)
+        self.round_keys = [rng.getrandbits(64) for _ in range(self.ROUNDS)]
+
+    def __getitem__(self, position):
+        # The rounds are inlined: this runs once or more per generated row
+        size, side, multiplier, mask64 = self.size, self.side, self.MULTIPLIER, self.MASK64
+        value = position
+        while True:
+            left, right = divmod(value, side)
+            for key in self.round_keys:
+                mixed = ((right ^ key) * multiplier) & mask64
+                left, right = right, (left + (mixed ^ (mixed >> 29))) % side
+            value = left * side + right
+            if value < size:
+                return value
+
+    def index(self, value):
+        """Return the position that ``value`` is permuted to."""
+        side, multiplier, mask64 = self.side, self.MULTIPLIER, self.MASK64
+        position = value
+        while True:
+            left, right = divmod(position, side)
+            for key in reversed(self.round_keys):
+                mixed = ((left ^ key) * multiplier) & mask64
+                left, right = (right - (mixed ^ (mixed >> 29))) % side, left
+            position = left * side + right
+            if position < self.size:
+                return position
+
+    def _encrypt_numpy(self, values):
+        side = np.uint64(self.side)
+        left, right = np.divmod(values, side)
+        for key in self.round_keys:
+            mixed = (right ^ np.uint64(key)) * np.uint64(self.MULTIPLIER)
+            left, right = right, (left + (mixed ^ (mixed >> np.uint64(29))) % side) % side
+        return left * side + right
+
+    def take_numpy(self, positions):
+        """Vectorized ``__getitem__`` over a uint64 array of positions."""
+        values = self._encrypt_numpy(positions)
+        outside = np.flatnonzero(values >= np.uint64(self.size))
+        while outside.size:
+            values[outside] = self._encrypt_numpy(values[outside])
+            outside = outside[values[outside] >= np.uint64(self.size)]
+        return values
+
+
+class UniqueKeySampler:
+    """Draws distinct values of a composite unique key, without replacement or retries.
+
+    The key space is the product of the candidate values of each key part
+    (``dimensions``), numbered in mixed radix and shuffled by a
+    KeyPermutation. Generated rows take the shuffled keys in order, passing
+    over the positions of keys already ``taken`` by existing rows, so the
+    key of the n-th generated row is fixed and a shard can draw its keys
+    from its row offset alone. Keys come back as one index per dimension.
+    """
+
+    def __init__(self, dimensions, taken=(), seed=0):
+        self.lengths = [len(values) for values in dimensions]
+        self.size = prod(self.lengths)
+        self.permutation = KeyPermutation(self.size, seed)
+        value_indexes = [{value: index for index, value in enumerate(values)} for values in dimensions]
+        taken_positions = set()
+        for key in taken:
+            indexes = [indexes.get(value) for indexes, value in zip(value_indexes, key)]
+            if None not in indexes:
+                taken_positions.add(self.permutation.index(self._number(indexes)))
+        self.taken_positions = array("q", sorted(taken_positions))
+
+    @property
+    def capacity(self):
+        """Number of keys still free."""
+        return self.size - len(self.taken_positions)
+
+    def _number(self, indexes):
+        number = 0
+        for index, length in zip(indexes, self.lengths):
+            number = number * length + index
+        return number
+
+    def _indexes(self, number):
+        indexes = []
+        for length in reversed(self.lengths):
+            number, index = divmod(number, length)
+            indexes.append(index)
+        indexes.reverse()
+        return indexes
+
+    def position(self, rank):
+        """Return the position of the ``rank``-th free key (0-based), by binary search."""
+        low, high = rank, rank + len(self.taken_positions)
+        while low < high:
+            middle = (low + high) // 2
+            if middle + 1 - bisect_right(self.taken_positions, middle) > rank:
+                high = middle
+            else:
+                low = middle + 1
+        return low
+
+    def keys(self, offset, rows):
+        """Yield the index tuples of the free keys ``offset`` to ``offset + rows``."""
+        position = self.position(offset)
+        taken = set(self.taken_positions[bisect_left(self.taken_positions, position):
+                                         bisect_left(self.taken_positions, self.position(offset + rows))])
+        for _ in range(rows):
+            while position in taken:
+                position += 1
+            yield self._indexes(self.permutation[position])
+            position += 1
+
+    def keys_numpy(self, offset, rows):
+        """Vectorized ``keys``: one index array per dimension."""
+        if not rows:
+            return [np.zeros(0, dtype=np.int64) for _ in self.lengths]
+        start, end = self.position(offset), self.position(offset + rows - 1) + 1
+        taken = np.frombuffer(self.taken_positions, dtype=np.int64)[
+            bisect_left(self.taken_positions, start):bisect_left(self.taken_positions, end)]
+        positions = np.delete(np.arange(start, end, dtype=np.uint64), taken - start)
+        numbers = self.permutation.take_numpy(positions)
+        indexes = []
+        for length in reversed(self.lengths):
+            numbers, index = np.divmod(numbers, np.uint64(length))
+            indexes.append(index.astype(np.int64))
+        return indexes[::-1]
+
+
+# Storage of each RowBlock column kind: array typecode, or None for a list of shared strings.
+# Dates are seconds since the epoch.
+COLUMN_TYPECODES = {"int": "q", "bool": "b", "date": "q", "float": "d", "str": None}
+
+COLUMN_READERS = {
+    "int": iter,
+    "bool": lambda values: map(bool, values),
+    "float": iter,
+    "str": iter,
+    "date": lambda values: map(format_timestamp, values),
+}
+
+REGISTRATION_LAYOUT = (
+    ("studentId", "int"), ("academicSessionId", "int"), ("semesterId", "int"), ("createdAt", "date"), ("updatedAt", "date"),
+)
+REGISTRATION_ENTRY_LAYOUT = (
+    ("studentId", "int"), ("registrationId", "int"), ("courseId", "int"), ("createdAt", "date"), ("updatedAt", "date"),
+    ("academicSessionId", "int"), ("semesterId", "int"),
+)
+RESULT_LAYOUT = (
+    ("studentId", "int"), ("courseId", "int"), ("academicSessionId", "int"), ("semesterId", "int"),
+    ("score", "float"), ("grade", "str"), ("createdAt", "date"), ("updatedAt", "date"),
+)
+
+NOTIFICATION_LAYOUT = (("userId", "int"), ("message", "str"), ("read", "bool"), ("createdAt", "date"))
+NOTIFICATION_MESSAGES = [f"Important announcement {number}" for number in range(1, 101)]
+
+LOG_LAYOUT = (
+    ("origin", "str"), ("details", "str"), ("ipAddress", "str"), ("userAgent", "str"), ("status", "str"), ("error", "str"),
+    ("createdAt", "date"), ("updatedAt", "date"),
+)
+
+# Logs arrive in calm periods broken by bursts, incidents in which they come
+# LOG_BURST_RATE times as fast and fail far more often. Each log starts a
+# burst or ends the current one with the given chance.
+LOG_BURST_START = 0.002
+LOG_BURST_END = 0.05
+LOG_BURST_RATE = 25
+LOG_FAILURE_RATES = (0.02, 0.35)  # Calm, burst
+# Period generated logs are spread over, as seconds since the epoch
+LOG_PERIOD = (parse_timestamp("2023-01-01T00:00:00"), parse_timestamp("2026-01-01T00:00:00"))
+LOG_ORIGINS = ["client", "server"]
+LOG_STATUSES = ["Success", "Failure"]
+LOG_DETAILS = [f"Random log detail {number}" for number in range(1, 21)]
+LOG_ERRORS = [f"Random error message {number}" for number in range(1, 16)]
+LOG_IP_ADDRESSES = [f"192.168.1.{number}" for number in range(1, 255)]
+
+GRADES = ["A", "B", "C", "D", "E", "F"]
+# Lowest score of each grade from E up to A, on the five point scale
+GRADE_FLOORS = [40, 45, 50, 60, 70]
+
+
+def grade_for_score(score):
+    return GRADES[len(GRADE_FLOORS) - bisect_right(GRADE_FLOORS, score)]
+
+
+def random_score(rng, grade_curve=None):
+    """Draw a score and its grade: uniform and unrelated without a ``grade_curve``, else along it."""
+    if grade_curve is None:
+        return round(rng.uniform(0, 100), 2), get_random(GRADES, rng)
+    score = round(min(max(rng.gauss(*grade_curve), 0), 100), 2)
+    return score, grade_for_score(score)
+
+# Year levels and semesters that courses and AllowedCourses rules are given,
+# in order; a session's semesters map to COURSE_SEMESTERS in ID order, as on the server
+YEAR_LEVELS = ["first", "second", "third", "fourth"]
+COURSE_SEMESTERS = ["FirstSemester", "SecondSemester"]
+
+# Courses a student registers for per semester, before the credit unit cap
+COURSE_LOAD = (4, 9)
+MAX_COURSE_LOAD = COURSE_LOAD[1]
+DEFAULT_MAXIMUM_CREDIT_UNIT = 22
+
+
+def new_columns(layout, nullable=()):
+    """Return empty columns to build a RowBlock of ``layout`` in.
+
+    The ``nullable`` columns, which may hold None, are plain lists, like
+    the string columns; the rest are arrays.
+    """
+    columns = []
+    for name, kind in layout:
+        typecode = COLUMN_TYPECODES[kind]
+        columns.append([] if typecode is None or name in nullable else array(typecode))
+    return columns
+
+
+def pack_column(kind, values):
+    """Store ``values`` in the compact form of ``kind``; columns holding None stay lists."""
+    typecode = COLUMN_TYPECODES[kind]
+    if typecode is None:
+        return list(values)
+    if isinstance(values, array):
+        return values
+    if np is not None and isinstance(values, np.ndarray):
+        return array(typecode, values.astype(typecode).tobytes())
+    try:
+        return array(typecode, values)
+    except TypeError:  # None values, from an empty lookup list
+        return list(values)
+
+
+class RowBlock:
+    """A shard of rows of one table, stored column by column.
+
+    ``layout`` lists the ``(column, kind)`` pairs after the ID; see
+    COLUMN_TYPECODES for how each kind is stored. IDs are consecutive from
+    ``first_id`` and not stored at all, unless given as ``ids``. A row takes
+    a few dozen bytes this way instead of several hundred as a dict, and
+    whole blocks pickle as flat buffers between processes. Iterating yields
+    the rows as dicts.
+    """
+
+    __slots__ = ("table_name", "first_id", "layout", "columns", "ids")
+
+    def __init__(self, table_name, first_id, layout, columns, ids=None):
+        self.table_name = table_name
+        self.first_id = first_id
+        self.layout = layout
+        self.columns = [pack_column(kind, values) for (_, kind), values in zip(layout, columns)]
+        self.ids = None if ids is None else pack_column("int", ids)
+
+    def __len__(self):
+        return len(self.columns[0])
+
+    def __iter__(self):
+        names = ["id"] + [name for name, _ in self.layout]
+        ids = range(self.first_id, self.first_id + len(self)) if self.ids is None else self.ids
+        if self.table_name in ID_PREFIXES:
+            ids = (format_id(self.table_name, numeric_id) for numeric_id in ids)
+        columns = [COLUMN_READERS[kind](values) for (_, kind), values in zip(self.layout, self.columns)]
+        for values in zip(ids, *columns):
+            yield dict(zip(names, values))
+
+
+def registration_rows(rng, first_id, rows, lookups, offset=0):
+    """Generate a RowBlock of ``rows`` Registration rows, IDs from ``first_id``.
+
+    Each registration is a distinct student and semester, the free keys
+    ``offset`` to ``offset + rows`` of the ``registration_keys``
+    UniqueKeySampler, dated within the academic session of the semester.
+    """
+    columns = new_columns(REGISTRATION_LAYOUT)
+    student_ids, academic_session_ids, semester_ids, created_at, updated_at = columns
+    students, semesters, semester_years = lookups["student_ids"], lookups["semester_pairs"], lookups["semester_years"]
+    recency = lookups["recency"]
+    for student, semester in lookups["registration_keys"].keys(offset, rows):
+        timestamp = random_timestamp(*semester_years[semester], rng=rng, recency=recency)
+        student_ids.append(students[student])
+        academic_session_ids.append(semesters[semester][0])
+        semester_ids.append(semesters[semester][1])
+        created_at.append(timestamp)
+        updated_at.append(timestamp)
+    return RowBlock("Registration", first_id, REGISTRATION_LAYOUT, columns)
+
+
+def course_load(rng, allowed_course_ids, course_credits, maximum_credit_unit, cum_weights=None):
+    """Draw the courses of one registration from the courses its AllowedCourses rule allows.
+
+    The student picks a load of COURSE_LOAD courses in random order, leaving
+    out any that would take them past ``maximum_credit_unit`` credits. With
+    ``cum_weights``, popular courses are picked first: draws are repeated
+    until the load is full or a few too many picked a course already taken.
+    """
+    if not allowed_course_ids:
+        return []
+    target = min(len(allowed_course_ids), rng.randint(*COURSE_LOAD))
+    if cum_weights is None:
+        wanted = rng.sample(allowed_course_ids, target)
+    else:
+        wanted = []
+        for _ in range(4 * target):
+            course_id = get_weighted(allowed_course_ids, cum_weights, rng)
+            if course_id not in wanted:
+                wanted.append(course_id)
+                if len(wanted) == target:
+                    break
+    load, credits = [], 0
+    for course_id in wanted:
+        if credits + course_credits[course_id] <= maximum_credit_unit:
+            load.append(course_id)
+            credits += course_credits[course_id]
+    return load
+
+
+def registration_entry_rows(rng, first_id, rows, lookups, offset=0):
+    """Generate a RowBlock of the RegistrationEntry rows of ``rows`` registrations.
+
+    The registrations are those of ``registration_rows`` at the same
+    ``offset``, re-derived from their keys. Each registration gets up to
+    MAX_COURSE_LOAD IDs from ``first_id`` on, one per course it registers.
+    """
+    columns = new_columns(REGISTRATION_ENTRY_LAYOUT)
+    student_ids, registration_ids, course_ids, created_at, updated_at, academic_session_ids, semester_ids = columns
+    entry_ids = array("q")
+    students, semesters, semester_years = lookups["student_ids"], lookups["semester_pairs"], lookups["semester_years"]
+    student_levels, allowed_courses = lookups["student_levels"], lookups["allowed_courses"]
+    allowed_weights, recency = lookups["allowed_weights"], lookups["recency"]
+    first_registration_id = lookups["first_registration_id"] + offset
+    keys = lookups["registration_keys"].keys(offset, rows)
+    for index, (student, semester) in enumerate(keys):
+        department_id, first_session = student_levels[student]
+        session_index, course_semester = lookups["semester_levels"][semester]
+        year_level = YEAR_LEVELS[min(max(session_index - first_session, 0), len(YEAR_LEVELS) - 1)]
+        bucket = (department_id, course_semester, year_level)
+        load = course_load(rng, allowed_courses.get(bucket, []), lookups["course_credits"],
+                           lookups["maximum_credit_unit"], allowed_weights.get(bucket))
+        timestamp = random_timestamp(*semester_years[semester], rng=rng, recency=recency)
+        for position, course_id in enumerate(load):
+            entry_ids.append(first_id + index * MAX_COURSE_LOAD + position)
+            student_ids.append(students[student])
+            registration_ids.append(first_registration_id + index)
+            course_ids.append(course_id)
+            created_at.append(timestamp)
+            updated_at.append(timestamp)
+            academic_session_ids.append(semesters[semester][0])
+            semester_ids.append(semesters[semester][1])
+    return RowBlock("RegistrationEntry", first_id, REGISTRATION_ENTRY_LAYOUT, columns, entry_ids)
+
+
+def result_rows(rng, first_id, rows, lookups, offset=0):
+    """Generate a RowBlock of ``rows`` Result rows, IDs from ``first_id``.
+
+    The keys are the free keys ``offset`` to ``offset + rows`` of the
+    ``result_keys`` UniqueKeySampler, over students, courses and semesters
+    (each with its own academic session).
+    """
+    columns = new_columns(RESULT_LAYOUT)
+    student_ids, course_ids, academic_session_ids, semester_ids, scores, grades, created_at, updated_at = columns
+    students, courses, semesters = lookups["student_ids"], lookups["course_ids"], lookups["semester_pairs"]
+    recency, grade_curve = lookups["recency"], lookups["grade_curve"]
+    for student, course, semester in lookups["result_keys"].keys(offset, rows):
+        timestamp = random_timestamp(rng=rng, recency=recency)
+        score, grade = random_score(rng, grade_curve)
+        student_ids.append(students[student])
+        course_ids.append(courses[course])
+        academic_session_ids.append(semesters[semester][0])
+        semester_ids.append(semesters[semester][1])
+        scores.append(score)
+        grades.append(grade)
+        created_at.append(timestamp)
+        updated_at.append(timestamp)
+    return RowBlock("Result", first_id, RESULT_LAYOUT, columns)
+
+
+def notification_rows(rng, first_id, rows, lookups, offset=0):
+    """Generate a RowBlock of ``rows`` Notification rows, IDs from ``first_id``."""
+    columns = new_columns(NOTIFICATION_LAYOUT, nullable=("userId",))
+    user_ids, messages, read, created_at = columns
+    users, recency = lookups["user_ids"], lookups["recency"]
+    for _ in range(rows):
+        user_ids.append(get_random(users, rng))
+        messages.append(get_random(NOTIFICATION_MESSAGES, rng))
+        read.append(rng.choice([True, False]))
+        created_at.append(random_timestamp(rng=rng, recency=recency))
+    return RowBlock("Notification", first_id, NOTIFICATION_LAYOUT, columns)
+
+
+def log_time(lookups, fraction, log1p=log1p):
+    """The time by which ``fraction`` of the generated logs have arrived, as seconds since the epoch.
+
+    Logs arrive evenly over the log period, or increasingly often with
+    ``recency``, each year 1 + recency times as many as the one before.
+    Pass ``np.log1p`` to map a whole array of fractions at once.
+    """
+    start, end = lookups["log_period"]
+    recency = lookups["recency"]
+    if recency:
+        years = (end - start) / (365.25 * 86400)
+        fraction = log1p(fraction * ((1 + recency) ** years - 1)) / (years * log(1 + recency))
+    return start + (end - start) * fraction
+
+
+def log_rows(rng, first_id, rows, lookups, offset=0):
+    """Generate a RowBlock of ``rows`` Log rows, IDs from ``first_id``, in time order.
+
+    The shard covers its own share of the logs, ``offset`` rows into them,
+    so shards follow one another in time and the whole table is ordered by
+    ``createdAt`` as well as ID without a global sort. Within the share, the
+    gaps between logs are drawn calm or bursty and scaled to fill it, and
+    each log's own fraction of all logs is mapped through ``log_time``.
+    """
+    first = offset / lookups["log_rows"]
+    share = rows / lookups["log_rows"]
+    gaps, bursts = array("d"), array("b")
+    bursting = False
+    for _ in range(rows):
+        bursting = rng.random() >= LOG_BURST_END if bursting else rng.random() < LOG_BURST_START
+        gaps.append(rng.expovariate(LOG_BURST_RATE if bursting else 1))
+        bursts.append(bursting)
+    scale = share / (sum(gaps) + rng.expovariate(1))
+
+    columns = new_columns(LOG_LAYOUT, nullable=("error",))
+    origins, details, ip_addresses, user_agents, statuses, errors, created_at, updated_at = columns
+    elapsed = 0.0
+    for gap, bursting in zip(gaps, bursts):
+        elapsed += gap
+        timestamp = int(log_time(lookups, first + elapsed * scale))
+        failed = rng.random() < LOG_FAILURE_RATES[bursting]
+        origins.append(get_random(LOG_ORIGINS, rng))
+        details.append(get_random(LOG_DETAILS, rng))
+        ip_addresses.append(get_random(LOG_IP_ADDRESSES, rng))
+        user_agents.append(f"Mozilla/5.0 (Random OS) AppleWebKit/{rng.randint(100, 999)}.{rng.randint(1, 99)} "
+                           f"(KHTML, like Gecko) RandomBrowser/{rng.randint(1, 50)}.{rng.randint(1, 9)}")
+        statuses.append(LOG_STATUSES[failed])
+        errors.append(get_random(LOG_ERRORS, rng) if failed else None)
+        created_at.append(timestamp)
+        updated_at.append(timestamp)
+    return RowBlock("Log", first_id, LOG_LAYOUT, columns)
+
+
+def random_timestamps_numpy(gen, rows, start_year=2023, end_year=2025, recency=0):
+    """Vectorized ``random_timestamp``: ``rows`` seconds since the epoch, drawn from the same distribution."""
+    if recency:
+        ratio = 1 + recency
+        span = np.asarray(end_year) - start_year + 1
+        years = np.minimum(start_year + (np.log1p(gen.random(rows) * (ratio ** span - 1)) / log(ratio)).astype("int64"), end_year)
+    else:
+        years = gen.integers(start_year, end_year + 1, rows)
+    months = gen.integers(1, 13, rows)
+    days = gen.integers(1, 29, rows)  # Keep it simple to avoid month-end issues
+    seconds = gen.integers(0, 24 * 60 * 60, rows)
+    timestamps = (
+        ((years - 1970) * 12 + months - 1).astype("datetime64[M]").astype("datetime64[D]")
+        + (days - 1).astype("timedelta64[D]")
+    ).astype("datetime64[s]") + seconds.astype("timedelta64[s]")
+    return timestamps.astype("int64")
+
+
+def registration_rows_numpy(rng, first_id, rows, lookups, offset=0):
+    """NumPy-backed ``registration_rows``: draws whole columns at once."""
+    gen = np.random.default_rng(rng.getrandbits(64))
+    students, semesters = lookups["registration_keys"].keys_numpy(offset, rows)
+    semester_pairs = np.asarray(lookups["semester_pairs"]).reshape(-1, 2)
+    semester_years = np.asarray(lookups["semester_years"]).reshape(-1, 2)
+    created_at = random_timestamps_numpy(gen, rows, semester_years[semesters, 0], semester_years[semesters, 1], lookups["recency"])
+    return RowBlock("Registration", first_id, REGISTRATION_LAYOUT, [
+        np.asarray(lookups["student_ids"])[students],
+        semester_pairs[semesters, 0],
+        semester_pairs[semesters, 1],
+        created_at,
+        created_at,
+    ])
+
+
+def result_rows_numpy(rng, first_id, rows, lookups, offset=0):
+    """NumPy-backed ``result_rows``: draws whole columns at once."""
+    gen = np.random.default_rng(rng.getrandbits(64))
+    students, courses, semesters = lookups["result_keys"].keys_numpy(offset, rows)
+    student_ids = np.asarray(lookups["student_ids"])[students]
+    course_ids = np.asarray(lookups["course_ids"])[courses]
+    semester_pairs = np.asarray(lookups["semester_pairs"]).reshape(-1, 2)
+    academic_session_ids, semester_ids = semester_pairs[semesters, 0], semester_pairs[semesters, 1]
+    if lookups["grade_curve"] is None:
+        scores = np.round(gen.uniform(0, 100, rows), 2)
+        grade_indexes = gen.integers(0, len(GRADES), rows)
+    else:
+        scores = np.round(np.clip(gen.normal(*lookups["grade_curve"], rows), 0, 100), 2)
+        grade_indexes = len(GRADE_FLOORS) - np.searchsorted(GRADE_FLOORS, scores, side="right")
+    # Index into GRADES, so every row shares its grade's string object
+    grades = [GRADES[index] for index in grade_indexes.tolist()]
+    created_at = random_timestamps_numpy(gen, rows, recency=lookups["recency"])
+    return RowBlock("Result", first_id, RESULT_LAYOUT, [
+        student_ids, course_ids, academic_session_ids, semester_ids, scores, grades, created_at, created_at,
+    ])
+
+
+def burst_flags_numpy(gen, rows):
+    """Vectorized calm/burst states of ``log_rows``: alternating runs of geometric length."""
+    runs = []
+    total = 0
+    while total < rows:
+        calm = gen.geometric(LOG_BURST_START, 64)
+        burst = gen.geometric(LOG_BURST_END, 64)
+        lengths = np.column_stack([calm, burst]).ravel()
+        runs.append(lengths)
+        total += int(lengths.sum())
+    lengths = np.concatenate(runs)
+    return np.repeat(np.tile([False, True], len(lengths) // 2), lengths)[:rows]
+
+
+def log_rows_numpy(rng, first_id, rows, lookups, offset=0):
+    """NumPy-backed ``log_rows``: draws whole columns at once."""
+    gen = np.random.default_rng(rng.getrandbits(64))
+    first = offset / lookups["log_rows"]
+    share = rows / lookups["log_rows"]
+    bursts = burst_flags_numpy(gen, rows)
+    elapsed = np.cumsum(gen.exponential(1, rows) / np.where(bursts, LOG_BURST_RATE, 1))
+    fractions = first + elapsed * (share / (elapsed[-1] + gen.exponential(1)))
+    created_at = log_time(lookups, fractions, np.log1p).astype("int64")
+    failed = gen.random(rows) < np.where(bursts, LOG_FAILURE_RATES[1], LOG_FAILURE_RATES[0])
+    # Index into the value lists, so rows share their string objects
+    user_agents = [
+        f"Mozilla/5.0 (Random OS) AppleWebKit/{webkit}.{webkit_minor} (KHTML, like Gecko) RandomBrowser/{major}.{minor}"
+        for webkit, webkit_minor, major, minor in zip(
+            gen.integers(100, 1000, rows).tolist(), gen.integers(1, 100, rows).tolist(),
+            gen.integers(1, 51, rows).tolist(), gen.integers(1, 10, rows).tolist())
+    ]
+    errors = gen.integers(0, len(LOG_ERRORS), rows).tolist()
+    return RowBlock("Log", first_id, LOG_LAYOUT, [
+        [LOG_ORIGINS[index] for index in gen.integers(0, len(LOG_ORIGINS), rows).tolist()],
+        [LOG_DETAILS[index] for index in gen.integers(0, len(LOG_DETAILS), rows).tolist()],
+        [LOG_IP_ADDRESSES[index] for index in gen.integers(0, len(LOG_IP_ADDRESSES), rows).tolist()],
+        user_agents,
+        [LOG_STATUSES[index] for index in failed.tolist()],
+        [LOG_ERRORS[index] if failure else None for index, failure in zip(errors, failed.tolist())],
+        created_at,
+        created_at,
+    ])
+
+
+# Row builders of the sharded tables, per generation path. Course loads are
+# drawn one registration at a time, so RegistrationEntry has no NumPy builder,
+# and Notification rows are few enough not to need one.
+ROW_FUNCTIONS = {
+    "python": {"Registration": registration_rows, "RegistrationEntry": registration_entry_rows, "Result": result_rows,
+               "Notification": notification_rows, "Log": log_rows},
+    "numpy": {"Registration": registration_rows_numpy, "RegistrationEntry": registration_entry_rows, "Result": result_rows_numpy,
+              "Notification": notification_rows, "Log": log_rows_numpy},
+}
+
+
+# Lookup lists shared by every shard a worker process generates
+_shard_lookups = None
+
+
+def _init_shard_worker(lookups):
+    global _shard_lookups
+    _shard_lookups = lookups
+
+
+def _generate_shard(task):
+    row_function, seed, first_id, rows, offset = task
+    return row_function(random.Random(seed), first_id, rows, _shard_lookups, offset)
+
+
+class ShardedRows:
+    """Rows generated by ``row_function`` in shards of ``shard_rows``, across ``workers`` processes.
+
+    Every shard gets its own sub-seed, drawn from ``rng``, and its slice of
+    the IDs reserved from ``first_id`` on, ``ids_per_row`` per row, both
+    assigned up front in shard order, and shards are yielded in that same
+    order. The output is therefore the same whatever the number of workers.
+    Row functions also get the offset of their shard's first row.
+
+    Shards are generated as the rows are iterated over, or ahead of that
+    once ``start`` is called, so tables can be generated concurrently.
+    Iterating yields the ``head`` rows first, the existing rows of the table.
+    """
+
+    def __init__(self, row_function, first_id, rows, lookups, rng, workers=1, shard_rows=SHARD_ROWS, ids_per_row=1,
+                 head=()):
+        self.head = head
+        self.row_function = row_function
+        self.lookups = lookups
+        self.workers = workers
+        self.tasks = deque()
+        for start in range(0, rows, shard_rows):
+            shard_size = min(shard_rows, rows - start)
+            self.tasks.append((row_function, rng.getrandbits(64), first_id + start * ids_per_row, shard_size, start))
+        self.pool = None
+        self.pending = deque()
+
+    @property
+    def parallel(self):
+        return self.workers > 1 and len(self.tasks) + len(self.pending) > 1
+
+    def start(self):
+        """Start generating shards in the background, if there are workers to."""
+        if self.parallel and self.pool is None:
+            self.pool = ProcessPoolExecutor(self.workers, initializer=_init_shard_worker, initargs=(self.lookups,))
+            self._submit()
+
+    def _submit(self):
+        # Keep only a few shards in flight so finished ones don't pile up in memory
+        while self.tasks and len(self.pending) < 2 * self.workers:
+            self.pending.append(self.pool.submit(_generate_shard, self.tasks.popleft()))
+
+    def __iter__(self):
+        yield from self.head
+        if not self.parallel:
+            while self.tasks:
+                _, seed, first_id, shard_size, start = self.tasks.popleft()
+                yield from self.row_function(random.Random(seed), first_id, shard_size, self.lookups, start)
+            return
+        self.start()
+        try:
+            while self.pending:
+                block = self.pending.popleft().result()
+                self._submit()
+                yield from block
+        finally:
+            self.pool.shutdown(cancel_futures=True)
+
+
+class GenerationRun:
+    """What the generation phases of one run share.
+
+    ``tables`` holds the rows of each model generated so far, existing rows
+    first; the sharded tables only hold their existing rows there, since
+    their generated rows are streamed. ``lookups`` caches the values several
+    phases draw from, see LOOKUPS, and holds what a phase leaves for the
+    phases that depend on it. ``generated`` holds the rows generated per
+    model, the requested counts unless a phase was ``capped``.
+    """
+
+    def __init__(self, existing_data, counts, seed, workers=1, vectorized=False, distribution="uniform", generated=None):
+        self.existing_data = existing_data
+        self.counts = counts
+        self.generated = {} if generated is None else generated
+        self.generated.update(counts)
+        self.seed = seed
+        self.workers = workers
+        self.row_functions = ROW_FUNCTIONS["numpy" if vectorized else "python"]
+        self.profile = DISTRIBUTION_PROFILES[distribution]
+        self.recency = self.profile["recency"]
+        self.tables = {}
+        self.ids = IdAllocator(self.tables, existing_data.get("NextId", []))
+        self.relations = RelationIndex()
+        self.lookups = {}
+
+    def start_table(self, model):
+        """Start ``model`` off with its existing rows, and return them."""
+        self.tables[model] = list(self.existing_data.get(model, []))
+        return self.tables[model]
+
+    def lookup(self, name):
+        if name not in self.lookups:
+            self.lookups[name] = LOOKUPS[name](self)
+        return self.lookups[name]
+
+    def rng(self, model):
+        return table_rng(self.seed, model)
+
+    def capped(self, model, capacity):
+        """Return how many rows of ``model`` to generate: the requested count, unless only ``capacity`` fit.
+
+        A shortfall is warned about and recorded in ``generated``.
+        """
+        rows = self.counts[model]
+        if rows > capacity:
+            print(f"Warning: only {capacity} of the {rows} {model} rows requested fit its unique key, "
+                  f"generating {capacity}", file=sys.stderr)
+            rows = self.generated[model] = capacity
+        return rows
+
+    def state(self):
+        """Return what the later phases need of this run, pickled, see ``restore``.
+
+        The NextId entries of the existing data go along, as the ID allocator
+        advances them in place.
+        """
+        return pickle.dumps((self.existing_data.get("NextId"), self.tables, self.ids, self.relations, self.lookups,
+                             self.generated), pickle.HIGHEST_PROTOCOL)
+
+    def restore(self, state):
+        next_ids, self.tables, self.ids, self.relations, self.lookups, generated = pickle.loads(state)
+        self.generated.update(generated)
+        if next_ids is not None:
+            self.existing_data["NextId"][:] = next_ids
+
+    def sharded(self, model, rows, lookups, rng=None, first_id=None, ids_per_row=1):
+        """The existing rows of ``model`` followed by ``rows`` rows of its row function, as ShardedRows."""
+        if first_id is None:
+            first_id = self.ids.reserve(model, rows * ids_per_row)
+        return ShardedRows(self.row_functions[model], first_id, rows, lookups, rng or self.rng(model), self.workers,
+                           ids_per_row=ids_per_row, head=self.tables[model])
+
+
+LECTURER_POSITIONS = ["professor", "doctor", "lecturer"]
+
+
+def course_buckets(run):
+    """Course IDs by (department, semester, year level), the buckets AllowedCourses rules cover."""
+    buckets = {}
+    for course in run.tables["Course"]:
+        bucket = (course.get("departmentId"), course.get("semester"), course.get("yearLevel"))
+        if None not in bucket:
+            buckets.setdefault(bucket, []).append(course["id"])
+    return buckets
+
+
+# Values several phases draw from, computed once per run from the tables they come from
+LOOKUPS = {
+    "department_ids": lambda run: [dept["id"] for dept in run.tables["Department"]],
+    # The first departments are the largest ones
+    "department_weights": lambda run: zipf_weights(len(run.lookup("department_ids")), run.profile["department_skew"]),
+    "lecturer_ids": lambda run: [staff["id"] for staff in run.tables["Staff"] if staff.get("position") in LECTURER_POSITIONS],
+    "student_ids": lambda run: [stu["id"] for stu in run.tables["Student"]],
+    "course_ids": lambda run: [course["id"] for course in run.tables["Course"]],
+    "course_buckets": course_buckets,
+    "academic_session_ids": lambda run: [session["id"] for session in run.tables["AcademicSession"]],
+    "semester_pairs": lambda run: [(semester["academicSessionId"], semester["id"]) for semester in run.tables["Semester"]],
+    "user_ids": lambda run: [user["id"] for user in run.tables["User"]],
+}
+
+Phase = namedtuple("Phase", "model depends build")
+
+# The generation phases, in the order they are declared
+PHASES = []
+
+
+def phase(model, depends=()):
+    """Declare the function generating ``model``, to run once the models it ``depends`` on are generated.
+
+    It gets the GenerationRun and returns the rows of the model: a list, or
+    an iterator for the tables streamed in shards.
+    """
+    def register(build):
+        PHASES.append(Phase(model, tuple(depends), build))
+        return build
+    return register
+
+
+@phase("AcademicSession")
+def generate_academic_sessions(run):
+    # Keep existing, maybe add one more
+    sessions = run.start_table("AcademicSession")
+    existing_session_names = {session["name"] for session in sessions}
+    next_year = max(int(s["name"].split('/')[0]) for s in sessions) + 1 if sessions else 2026
+    new_session_name = f"{next_year}/{next_year + 1}"
+    if new_session_name not in existing_session_names:
+        sessions.append({
+            "id": run.ids.next_id("AcademicSession"),
+            "name": new_session_name
         })
+    return sessions
 
-    # Result
-    filler_data["Result"] = list(existing_data.get("Result", []))
-    if student_ids and course_ids and academic_session_ids and semester_ids:
-        for _ in range(15): # Generate 15 results
-            filler_data["Result"].append({
-                "id": generate_unique_id("Result", filler_data),
-                "studentId": get_random(student_ids),
-                "courseId": get_random(course_ids),
-                "academicSessionId": get_random(academic_session_ids),
-                "semesterId": get_random(semester_ids),
-                "score": round(random.uniform(0, 100), 2),
-                "grade": get_random(["A", "B", "C", "D", "E", "F"]),
-            })
 
-    # Semester (Keep existing, maybe add for a new academic session)
-    filler_data["Semester"] = list(existing_data.get("Semester", []))
-    existing_session_semester_pairs = {(sem["academicSessionId"], sem["name"]) for sem in filler_data["Semester"]}
-    for session_id in academic_session_ids:
+@phase("Semester", depends=["AcademicSession"])
+def generate_semesters(run):
+    # Keep existing, add the missing ones of every academic session
+    semesters = run.start_table("Semester")
+    existing_session_semester_pairs = {(sem["academicSessionId"], sem["name"]) for sem in semesters}
+    for session_id in run.lookup("academic_session_ids"):
         for semester_name in ["First Semester", "Second Semester"]:
             if (session_id, semester_name) not in existing_session_semester_pairs:
-                filler_data["Semester"].append({
-                    "id": generate_unique_id("Semester", filler_data),
+                semesters.append({
+                    "id": run.ids.next_id("Semester"),
                     "name": semester_name,
                     "academicSessionId": session_id
                 })
                 existing_session_semester_pairs.add((session_id, semester_name))
+    return semesters
+
+
+@phase("SchoolSetting", depends=["AcademicSession"])
+def generate_school_settings(run):
+    # Keep existing
+    settings = run.start_table("SchoolSetting")
+    if settings:
+        settings[0]["currentAcademicSessionId"] = get_random(run.lookup("academic_session_ids"), run.rng("SchoolSetting"))
+    return settings
+
+
+@phase("Faculty")
+def generate_faculties(run):
+    # Keep existing, maybe add one more for a dean without a faculty
+    faculties = run.start_table("Faculty")
+    rng = run.rng("Faculty")
+    faculty_codes = CodeSequencer(fac["code"] for fac in faculties)
+    available_deans = [dean["staffId"] for dean in run.existing_data.get("Dean", []) if dean.get("facultyId") is None]
+    if available_deans:
+        faculties.append({
+            "id": run.ids.next_id("Faculty"),
+            "name": f"Faculty of {get_random(['Business', 'Law'], rng)}",
+            "code": faculty_codes.next_code(get_random(['BUS', 'LAW'], rng)),
+            "createdAt": random_date(rng=rng, recency=run.recency),
+            "isDeleted": 0,
+            "updatedAt": random_date(rng=rng, recency=run.recency),
+            "deanId": get_random(available_deans, rng)
+        })
+    return faculties
 
-    # Student
-    filler_data["Student"] = list(existing_data.get("Student", []))
-    existing_student_ids = {stu["studentId"] for stu in filler_data["Student"]}
-    for _ in range(2): # Generate 2 more students
-        first_name = get_random(["Grace", "Henry"])
-        last_name = get_random(["Miller", "Wilson"])
-        student_id = generate_unique_code("STU", existing_student_ids)
-        filler_data["Student"].append({
-            "id": generate_unique_id("Student", filler_data),
+
+@phase("Department", depends=["Faculty"])
+def generate_departments(run):
+    # Keep existing, maybe add one more if faculties are lacking
+    departments = run.start_table("Department")
+    rng = run.rng("Department")
+    department_codes = CodeSequencer(dept["code"] for dept in departments)
+    run.relations.add("Department", departments)
+    available_faculties_for_dept = [fac["id"] for fac in run.tables["Faculty"]
+                                    if not run.relations.references("Department", "facultyId", fac["id"])]
+    # Department names and HOD references are unique
+    available_names_for_dept = [name for name in [f"New {field} Department" for field in ['Engineering', 'Science', 'Arts']]
+                                if not run.relations.references("Department", "name", name)]
+    available_hods_for_dept = [hod["staffId"] for hod in run.existing_data.get("HOD", [])
+                               if not run.relations.references("Department", "hodId", hod["staffId"])]
+    if available_faculties_for_dept and available_names_for_dept:
+        new_department = {
+            "id": run.ids.next_id("Department"),
+            "name": get_random(available_names_for_dept, rng),
+            "code": department_codes.next_code(get_random(['ENG', 'SCI', 'ART'], rng)),
+            "hodId": get_random(available_hods_for_dept, rng),
+            "facultyId": get_random(available_faculties_for_dept, rng),
+            "isDeleted": 0
+        }
+        departments.append(new_department)
+        run.relations.add("Department", [new_department])
+    return departments
+
+
+@phase("Staff", depends=["Department"])
+def generate_staff(run):
+    staff_rows = run.start_table("Staff")
+    rng = run.rng("Staff")
+    staff_codes = run.lookups["staff_codes"] = CodeSequencer(
+        (staff["staffId"] for staff in staff_rows), code_width("Staff.staffId", len(staff_rows) + run.counts["Staff"]))
+    department_ids, department_weights = run.lookup("department_ids"), run.lookup("department_weights")
+    staff_positions = ["lecturer", "assistant", "professor", "doctor"]
+    for _ in range(run.counts["Staff"]):
+        first_name = get_random(["Alice", "Bob", "Charlie", "David", "Eve"], rng)
+        last_name = get_random(["Smith", "Jones", "Williams", "Brown", "Davis"], rng)
+        staff_id = staff_codes.next_code("STAFF")
+        staff_rows.append({
+            "id": run.ids.next_id("Staff"),
             "userId": None,
-            "studentId": student_id,
+            "staffId": staff_id,
             "firstName": first_name,
             "lastName": last_name,
-            "departmentId": get_random(department_ids),
-            "createdAt": random_date(),
+            "position": get_random(staff_positions, rng),
+            "departmentId": get_weighted(department_ids, department_weights, rng),
+            "createdAt": random_date(rng=rng, recency=run.recency),
             "isDeleted": 0
         })
-        existing_student_ids.add(student_id)
-
-    # Notification (Add a few random notifications)
-    filler_data["Notification"] = list(existing_data.get("Notification", []))
-    user_ids = [user["id"] for user in existing_data.get("User", [])]
-    for _ in range(3):
-        filler_data["Notification"].append({
-            "id": generate_unique_id("Notification", filler_data),
-            "userId": get_random(user_ids),
-            "message": f"Important announcement {random.randint(1, 100)}",
-            "read": random.choice([True, False]),
-            "createdAt": random_date()
-        })
+    return staff_rows
 
-    # Faculty (Keep existing, maybe add one more)
-    filler_data["Faculty"] = list(existing_data.get("Faculty", []))
-    existing_faculty_codes = {fac["code"] for fac in filler_data["Faculty"]}
-    available_deans = [dean["staffId"] for dean in filler_data.get("Dean", []) if dean.get("facultyId") is None]
-    if available_deans:
-        filler_data["Faculty"].append({
-            "id": generate_unique_id("Faculty", filler_data),
-            "name": f"Faculty of {get_random(['Business', 'Law'])}",
-            "code": generate_unique_code(get_random(['BUS', 'LAW']), existing_faculty_codes),
-            "createdAt": random_date(),
-            "isDeleted": 0,
-            "updatedAt": random_date(),
-            "deanId": get_random(available_deans)
-        })
-
-    # SchoolSetting (Keep existing)
-    filler_data["SchoolSetting"] = list(existing_data.get("SchoolSetting", []))
-    academic_session_ids = [session["id"] for session in existing_data.get("AcademicSession", [])]
-    if filler_data["SchoolSetting"]:
-        filler_data["SchoolSetting"][0]["currentAcademicSessionId"] = get_random(academic_session_ids)
 
-    # AcademicSession (Keep existing, maybe add one more)
-    filler_data["AcademicSession"] = list(existing_data.get("AcademicSession", []))
-    existing_session_names = {session["name"] for session in filler_data["AcademicSession"]}
-    next_year = max(int(s["name"].split('/')[0]) for s in filler_data["AcademicSession"]) + 1 if filler_data["AcademicSession"] else 2026
-    new_session_name = f"{next_year}/{next_year + 1}"
-    if new_session_name not in existing_session_names:
-        filler_data["AcademicSession"].append({
-            "id": generate_unique_id("AcademicSession", filler_data),
-            "name": new_session_name
+@phase("Student", depends=["Department"])
+def generate_students(run):
+    students = run.start_table("Student")
+    rng = run.rng("Student")
+    student_codes = run.lookups["student_codes"] = CodeSequencer(
+        (stu["studentId"] for stu in students), code_width("Student.studentId", len(students) + run.counts["Student"]))
+    department_ids, department_weights = run.lookup("department_ids"), run.lookup("department_weights")
+    for _ in range(run.counts["Student"]):
+        first_name = get_random(["Grace", "Henry"], rng)
+        last_name = get_random(["Miller", "Wilson"], rng)
+        student_id = student_codes.next_code("STU")
+        students.append({
+            "id": run.ids.next_id("Student"),
+            "userId": None,
+            "studentId": student_id,
+            "firstName": first_name,
+            "lastName": last_name,
+            "departmentId": get_weighted(department_ids, department_weights, rng),
+            "createdAt": random_date(rng=rng, recency=run.recency),
+            "isDeleted": 0
         })
+    return students
 
-    # User
-    filler_data["User"] = list(existing_data.get("User", []))
-    existing_emails = {user["email"] for user in filler_data["User"]}
-    student_ids_for_user = [stu["id"] for stu in existing_data.get("Student", []) if not any(u["studentId"] == stu["id"] for u in filler_data["User"])]
-    staff_ids_for_user = [staff["id"] for staff in existing_data.get("Staff", []) if not any(u["staffId"] == staff["id"] for u in filler_data["User"])]
-    roles = ["Student", "Staff"]
-    for _ in range(2): # Generate 2 more users
-        first_name = get_random(["Ivy", "Kevin"])
-        last_name = get_random(["Moore", "Taylor"])
-        role = get_random(roles)
-        email = f"{first_name.lower()}.{last_name.lower()}{random.randint(1, 100)}@school.com"
-        if email not in existing_emails:
-            new_user = {
-                "id": generate_unique_id("User", filler_data),
-                "email": email,
-                "password": "$2a$10$fakehashedpassword", # Replace with actual hashing in real app
-                "role": role,
-                "studentId": get_random(student_ids_for_user) if role == "Student" else None,
-                "staffId": get_random(staff_ids_for_user) if role == "Staff" else None,
-                "isDeleted": 0,
-                "createdAt": random_date()
-            }
-            filler_data["User"].append(new_user)
-            existing_emails.add(email)
-
-    # Log (Add a few random logs)
-    filler_data["Log"] = list(existing_data.get("Log", []))
-    error_origins = ["client", "server"]
-    statuses = ["Success", "Failure"]
-    for _ in range(5):
-        filler_data["Log"].append({
-            "id": generate_unique_id("Log", filler_data),
-            "origin": get_random(error_origins),
-            "details": f"Random log detail {random.randint(1, 20)}",
-            "ipAddress": f"192.168.1.{random.randint(1, 254)}",
-            "userAgent": f"Mozilla/5.0 (Random OS) AppleWebKit/{random.randint(100, 999)}.{random.randint(1, 99)} (KHTML, like Gecko) RandomBrowser/{random.randint(1, 50)}.{random.randint(1, 9)}",
-            "status": get_random(statuses),
-            "error": f"Random error message {random.randint(1, 15)}" if random.random() < 0.3 else None,
-            "createdAt": random_date(),
-            "updatedAt": random_date()
+
+@phase("Course", depends=["Department", "Staff"])
+def generate_courses(run):
+    courses = run.start_table("Course")
+    rng = run.rng("Course")
+    course_codes = CodeSequencer((course["code"] for course in courses),
+                                 code_width("Course.code", len(courses) + run.counts["Course"]))
+    department_ids, department_weights = run.lookup("department_ids"), run.lookup("department_weights")
+    lecturer_ids = run.lookup("lecturer_ids")
+    for _ in range(run.counts["Course"]):
+        courses.append({
+            "id": run.ids.next_id("Course"),
+            "name": f"Advanced {get_random(['Mathematics', 'Physics', 'Chemistry', 'Biology', 'History'], rng)}",
+            "code": course_codes.next_code(get_random(['MATH', 'PHY', 'CHEM', 'BIO', 'HIST'], rng)),
+            "credits": rng.randint(2, 4),
+            "departmentId": get_weighted(department_ids, department_weights, rng),
+            "lecturerId": get_random(lecturer_ids, rng),
+            "yearLevel": get_random(YEAR_LEVELS, rng),
+            "semester": get_random(COURSE_SEMESTERS, rng),
+            "createdAt": random_date(rng=rng, recency=run.recency),
+            "isDeleted": 0
         })
+    return courses
 
-    return filler_data
 
-if __name__ == "__main__":
-    existing_data = {
-      "Course": [
-        {
-          "id": 1,
-          "name": "Computer Analysis",
-          "code": "CSE 191",
-          "credits": 3,
-          "departmentId": 1,
-          "lecturerId": 5,
-          "createdAt": "2025-05-13T10:26:16.126Z",
-          "isDeleted": 0
-        }
-      ],
-      "Registration": [],
-      "HOD": [
-        {
-          "id": 1,
-          "staffId": 1,
-          "departmentId": 1,
-          "isDeleted": 0
-        },
-        {
-          "id": 2,
-          "staffId": 8,
-          "departmentId": 2,
-          "isDeleted": 0
-        }
-      ],
-      "NextId": [
-        {
-          "id": 1,
-          "tableName": "staff",
-          "nextId": 12
-        },
-        {
-          "id": 2,
-          "tableName": "student",
-          "nextId": 4
-        }
-      ],
-      "Staff": [
-        {
-          "id": 1,
-          "userId": None,
-          "staffId": "STAFF00001",
-          "firstName": "Oreoluwa",
-          "lastName": "Hallel",
-          "position": "professor",
-          "departmentId": 1,
-          "createdAt": "2025-05-12T11:02:58.661Z",
-          "isDeleted": 0
-        },
-        {
-          "id": 4,
-          "userId": None,
-          "staffId": "STAFF00002",
-          "firstName": "Oreoluwa",
-          "lastName": "Hallel",
-          "position": "professor",
-          "departmentId": 1,
-          "createdAt": "2025-05-12T11:08:19.673Z",
-          "isDeleted": 0
-        },
-        {
-          "id": 5,
-          "userId": None,
-          "staffId": "STAFF00003",
-          "firstName": "Johnson",
-          "lastName": "Emmanuel",
-          "position": "doctor",
-          "departmentId": 1,
-          "createdAt": "2025-05-12T11:28:33.333Z",
-          "isDeleted": 0
-        },
-        {
-          "id": 8,
-          "userId": None,
-          "staffId": "STAFF00004",
-          "firstName": "Teacher",
-          "lastName": "School",
-          "position": "lecturer",
-          "departmentId": 2,
-          "createdAt": "2025-05-12T11:31:15.267Z",
-          "isDeleted": 0
-        }
-      ],
-      "Department": [
-        {
-          "id": 1,
-          "name": "Computer Science",
-          "code": "CSE",
-          "hodId": 1,
-          "facultyId": 1,
-          "isDeleted": 0
-        },
-        {
-          "id": 2,
-          "name": "Literature",
-          "code": "LIT",
-          "hodId": 2,
-          "facultyId": 2,
-          "isDeleted": 0
-        }
-      ],
-      "Dean": [],
-      "Result": [],
-      "Semester": [
-        {
-          "id": 1,
-          "name": "First Semester",
-          "academicSessionId": 1
-        },
-        {
-          "id": 2,
-          "name": "Second Semester",
-          "academicSessionId": 1
-        },
-        {
-          "id": 3,
-          "name": "First Semester",
-          "academicSessionId": 2
-        },
-        {
-          "id": 4,
-          "name": "Second Semester",
-          "academicSessionId": 2
-        }
-      ],
-      "Student": [
-        {
-          "id": 1,
-          "userId": None,
-          "studentId": "STU00001",
-          "firstName": "First",
-          "lastName": "Prof",
-          "departmentId": 2,
-          "createdAt": "2025-05-12T16:13:28.744Z",
-          "isDeleted": 0
-        },
-        {
-          "id": 2,
-          "userId": None,
-          "studentId": "STU00003",
-          "firstName": "John",
-          "lastName": "Doe",
-          "departmentId": 1,
-          "createdAt": "2025-05-12T17:49:49.901Z",
-          "isDeleted": 0
-        }
-      ],
-      "Notification": [],
-      "Faculty": [
-        {
-          "id": 1,
-          "name": "Science",
-          "code": "SCI",
-          "createdAt": "2025-05-12T10:33:00.757Z",
-          "isDeleted": 0,
-          "updatedAt": "2025-05-12T13:40:56.109Z",
-          "deanId": 4
-        },
-        {
-          "id": 2,
-          "name": "Faculty of Arts",
-          "code": "ART",
-          "createdAt": "2025-05-12T14:41:19.159Z",
-          "isDeleted": 0,
-          "updatedAt": "2025-05-13T10:39:08.525Z",
-          "deanId": 8
-        },
-        {
-          "id": 3,
-          "name": "Faculty of Engineering",
-          "code": "ENG",
-          "createdAt": "2025-05-13T12:12:25.504Z",
-          "isDeleted": 0,
-          "updatedAt": "2025-05-13T12:12:25.504Z",
-          "deanId": None
-        }
-      ],
-      "SchoolSetting": [
-        {
-          "id": 7,
-          "name": "Cyberwizdev University",
-          "address": "123 Education Street, Knowledge City, 12345",
-          "currentAcademicSessionId": 2,
-          "semestersPerSession": 2
-        }
-      ],
-      "AcademicSession": [
-        {
-          "id": 1,
-          "name": "2023/2024"
-        },
-        {
-          "id": 2,
-          "name": "2024/2025"
+@phase("HOD", depends=["Staff", "Department"])
+def generate_hods(run):
+    # Keep existing, maybe add one more if departments are lacking
+    hods = run.start_table("HOD")
+    rng = run.rng("HOD")
+    run.relations.add("HOD", hods)
+    available_staff_for_hod = [staff["id"] for staff in run.tables["Staff"]
+                               if staff.get("position") in LECTURER_POSITIONS
+                               and not run.relations.references("HOD", "departmentId", staff["departmentId"])
+                               and not run.relations.references("HOD", "staffId", staff["id"])]
+    available_departments_for_hod = [dept_id for dept_id in run.lookup("department_ids")
+                                     if not run.relations.references("HOD", "departmentId", dept_id)]
+    if available_staff_for_hod and available_departments_for_hod:
+        new_hod = {
+            "id": run.ids.next_id("HOD"),
+            "staffId": get_random(available_staff_for_hod, rng),
+            "departmentId": get_random(available_departments_for_hod, rng),
+            "isDeleted": 0
         }
-      ],
-      "User": [
-        {
-          "id": 1,
-          "email": "hallelojowuro@gmail.com",
-          "password": "$2a$12$.a/yiN5hYNmKqKo75qBx9uw0UrzwtK6Bgpjx6ABQ9w1GQc3yyAqcW",
-          "role": "Admin",
-          "studentId": None,
-          "staffId": None,
-          "isDeleted": 0,
-          "createdAt": "2025-05-10T15:04:38.097Z"
-        },
-        {
-          "id": 2,
-          "email": "john.doe@school.com",
-          "password": "$2a$10$ViBB6cNCUeYW033a1/igtut/9Fb9bmjDfrJddZ0iGRu5V6MuneZma",
-          "role": "Student",
-          "studentId": 2,
-          "staffId": None,
-          "isDeleted": 0,
-          "createdAt": "2025-05-10T15:04:38.097Z"
-        },
-        {
-          "id": 3,
-          "email": "jane.smith@school.com",
-          "password": "$2a$10$ViBB6cNCUeYW033a1/igtut/9Fb9bmjDfrJddZ0iGRu5V6MuneZma",
-          "role": "Student",
-          "studentId": None,
-          "staffId": None,
-          "isDeleted": 0,
-          "createdAt": "2025-05-10T15:04:38.097Z"
-        },
-        {
-          "id": 4,
-          "email": "prof.johnson@school.com",
-          "password": "$2a$10$2EYlFOp..chzzkCR.rEb3eDnmbPyGRqBagCm1yFBGDIR4Alf./f4q",
-          "role": "Staff",
-          "studentId": None,
-          "staffId": 5,
-          "isDeleted": 0,
-          "createdAt": "2025-05-10T15:04:38.097Z"
-        },
-        {
-          "id": 5,
-          "email": "admin@school.com",
-          "password": "$2a$10$ViBB6cNCUeYW033a1/igtut/9Fb9bmjDfrJddZ0iGRu5V6MuneZma",
-          "role": "Admin",
-          "studentId": None,
-          "staffId": None,
-          "isDeleted": 0,
-          "createdAt": "2025-05-10T15:04:38.097Z"
-        },
-        {
-          "id": 8,
-          "email": "admin@school.cyberwizdev.com.ng",
-          "password": "$2a$10$GDEuaidK0vKk4wGMiqacq.bVae0WYNqT.M.jGYYisSsltFgWeMxe2",
-          "role": "Admin",
-          "studentId": None,
-          "staffId": None,
-          "isDeleted": 0,
-          "createdAt": "2025-05-10T15:04:38.097Z"
-        },
-        {
-          "id": 9,
-          "email": "student@school.com",
-          "password": "$2a$10$c6muCyfR29fRZA0oiwCnIeG2/dhaph50NsX0iFXN94nTL3btbOa4m",
-          "role": "Student",
-          "studentId": 1,
-          "staffId": None,
-          "isDeleted": 0,
-          "createdAt": "2025-05-10T13:33:12.404Z"
-        },
-        {
-          "id": 10,
-          "email": "teacher@school.com",
-          "password": "$2a$10$4dJJpu9wqpkUQPouYZ2Dxuhwa9Sgd/IDBsrhmW0FzxE4St0/U/jcu",
-          "role": "Staff",
-          "studentId": None,
-          "staffId": 8,
-          "isDeleted": 0,
-          "createdAt": "2025-05-10T16:17:48.608Z"
-        },
-        {
-          "id": 11,
-          "email": "ore@school.com",
-          "password": "$2a$10$Nr/dyyaXPUoRHjmYJ7GRIeNMpdRxMkFxJuo5BVpIOwU.Qzg3upi6G",
-          "role": "Staff",
-          "studentId": None,
-          "staffId": 1,
-          "isDeleted": 0,
-          "createdAt": "2025-05-12T11:02:58.661Z"
-        },
-        {
-          "id": 12,
-          "email": "oreoluwa@school.com",
-          "password": "$2a$10$nIDkdFtybmrYuYWTQHRzU.W1pHIFORXiyVex6l1SG7uEOo8RZK9eq",
-          "role": "Staff",
-          "studentId": None,
-          "staffId": 4,
-          "isDeleted": 0,
-          "createdAt": "2025-05-12T11:08:19.673Z"
+        hods.append(new_hod)
+        run.relations.add("HOD", [new_hod])
+    return hods
+
+
+@phase("Dean", depends=["Staff", "Faculty"])
+def generate_deans(run):
+    # Keep existing, maybe add one more if staff are available
+    deans = run.start_table("Dean")
+    rng = run.rng("Dean")
+    run.relations.add("Dean", deans)
+    available_staff_for_dean = [staff["id"] for staff in run.tables["Staff"] if staff.get("position") == "professor"
+                                and not run.relations.references("Dean", "staffId", staff["id"])]
+    # The faculty added for a dean already has one
+    available_faculty_for_dean = [fac["id"] for fac in run.existing_data.get("Faculty", [])
+                                  if not run.relations.references("Dean", "facultyId", fac["id"])]
+    if available_staff_for_dean and available_faculty_for_dean:
+        new_dean = {
+            "id": run.ids.next_id("Dean"),
+            "staffId": get_random(available_staff_for_dean, rng),
+            "facultyId": get_random(available_faculty_for_dean, rng),
+            "isDeleted": 0
         }
-      ],
-      "Notification": [],
-      "Faculty": [
-        {
-          "id": 1,
-          "name": "Science",
-          "code": "SCI",
-          "createdAt": "2025-05-12T10:33:00.757Z",
-          "isDeleted": 0,
-          "updatedAt": "2025-05-12T13:40:56.109Z",
-          "deanId": 4
-        },
-        {
-          "id": 2,
-          "name": "Faculty of Arts",
-          "code": "ART",
-          "createdAt": "2025-05-12T14:41:19.159Z",
-          "isDeleted": 0,
-          "updatedAt": "2025-05-13T10:39:08.525Z",
-          "deanId": 8
-        },
-        {
-          "id": 3,
-          "name": "Faculty of Engineering",
-          "code": "ENG",
-          "createdAt": "2025-05-13T12:12:25.504Z",
-          "isDeleted": 0,
-          "updatedAt": "2025-05-13T12:12:25.504Z",
-          "deanId": None
+        deans.append(new_dean)
+        run.relations.add("Dean", [new_dean])
+    return deans
+
+
+@phase("AllowedCourses", depends=["Course"])
+def generate_allowed_courses(run):
+    # One rule per department, semester and year level that has courses
+    rules = run.start_table("AllowedCourses")
+    rule_ids = run.lookups["rule_ids"] = {(rule["departmentId"], rule["semester"], rule["yearLevel"]): rule["id"] for rule in rules}
+    for bucket in run.lookup("course_buckets"):
+        if bucket not in rule_ids:
+            rule_ids[bucket] = run.ids.next_id("AllowedCourses")
+            department_id, semester, year_level = bucket
+            rules.append({
+                "id": rule_ids[bucket],
+                "departmentId": department_id,
+                "semester": semester,
+                "yearLevel": year_level,
+            })
+    return rules
+
+
+@phase("AllowedCourseEntry", depends=["AllowedCourses"])
+def generate_allowed_course_entries(run):
+    # Every course is allowed by the rule of its bucket
+    entries = run.start_table("AllowedCourseEntry")
+    rng = run.rng("AllowedCourseEntry")
+    rule_ids = run.lookups["rule_ids"]
+    allowed_pairs = {(entry["allowedCoursesId"], entry["courseId"]) for entry in entries}
+    for bucket, bucket_course_ids in run.lookup("course_buckets").items():
+        for course_id in bucket_course_ids:
+            if (rule_ids[bucket], course_id) not in allowed_pairs:
+                allowed_pairs.add((rule_ids[bucket], course_id))
+                created_at = random_date(rng=rng, recency=run.recency)
+                entries.append({
+                    "id": run.ids.next_id("AllowedCourseEntry"),
+                    "allowedCoursesId": rule_ids[bucket],
+                    "courseId": course_id,
+                    "createdAt": created_at,
+                    "updatedAt": created_at,
+                })
+    return entries
+
+
+@phase("Registration", depends=["Student", "Semester"])
+def generate_registrations(run):
+    # One per student and semester at most, as the server registers them;
+    # every semester comes with its own academic session
+    registrations = run.start_table("Registration")
+    rng = run.rng("Registration")
+    student_ids, semester_pairs = run.lookup("student_ids"), run.lookup("semester_pairs")
+    registration_keys = UniqueKeySampler(
+        [student_ids, semester_pairs],
+        ((registration.get("studentId"), (registration.get("academicSessionId"), registration.get("semesterId")))
+         for registration in registrations),
+        rng.getrandbits(64),
+    )
+    # Sessions are named "2023/2024"; registrations fall within the years of theirs
+    session_years = {}
+    for session in run.tables["AcademicSession"]:
+        years = [int(year) for year in re.findall(r"\d{4}", session["name"])]
+        session_years[session["id"]] = (min(years), max(years)) if years else (2023, 2025)
+    # Never more registrations than there are free keys
+    registration_count = run.capped("Registration", registration_keys.capacity)
+    lookups = run.lookups["registration"] = {
+        "student_ids": student_ids,
+        "semester_pairs": semester_pairs,
+        "semester_years": [session_years.get(session_id, (2023, 2025)) for session_id, _ in semester_pairs],
+        "registration_keys": registration_keys,
+        "registration_count": registration_count,
+        "first_registration_id": run.ids.reserve("Registration", registration_count),
+        "recency": run.recency,
+    }
+    return run.sharded("Registration", registration_count, lookups, rng, lookups["first_registration_id"])
+
+
+@phase("RegistrationEntry", depends=["Registration", "AllowedCourseEntry", "SchoolSetting"])
+def generate_registration_entries(run):
+    # The courses of each generated registration, as the server adds them:
+    # one entry per course, within the maximum credit units
+    run.start_table("RegistrationEntry")
+    semester_pairs = run.lookup("semester_pairs")
+    sessions = sorted(run.tables["AcademicSession"], key=lambda session: session["name"])
+    session_indexes = {session["id"]: index for index, session in enumerate(sessions)}
+    # The n-th semester of a session, by ID, is the n-th CourseSemester
+    session_semesters = {}
+    for session_id, semester_id in sorted(semester_pairs, key=lambda pair: pair[1]):
+        session_semesters.setdefault(session_id, []).append(semester_id)
+    semester_levels = [
+        (session_indexes.get(session_id, 0),
+         COURSE_SEMESTERS[min(session_semesters[session_id].index(semester_id), len(COURSE_SEMESTERS) - 1)])
+        for session_id, semester_id in semester_pairs
+    ]
+    # A student is in their first year in the session they enrolled in, by the year of createdAt
+    student_levels = []
+    for stu in run.tables["Student"]:
+        enrolled = str(stu.get("createdAt") or "")[:4]
+        first_session = next((index for index, session in enumerate(sessions) if enrolled and enrolled in session["name"]), 0)
+        student_levels.append((stu.get("departmentId"), first_session))
+    # Courses per AllowedCourses rule, falling back to all courses of the department and semester
+    course_credits = {course["id"]: course.get("credits") or 0 for course in run.tables["Course"]}
+    rule_buckets = {rule["id"]: (rule["departmentId"], rule["semester"], rule["yearLevel"]) for rule in run.tables["AllowedCourses"]}
+    allowed_courses = {}
+    for entry in run.tables["AllowedCourseEntry"]:
+        if entry["allowedCoursesId"] in rule_buckets and entry["courseId"] in course_credits:
+            allowed_courses.setdefault(rule_buckets[entry["allowedCoursesId"]], []).append(entry["courseId"])
+    department_courses = {}
+    for (department_id, semester, _), bucket_course_ids in run.lookup("course_buckets").items():
+        department_courses.setdefault((department_id, semester), []).extend(bucket_course_ids)
+    for (department_id, semester), semester_course_ids in department_courses.items():
+        for year_level in YEAR_LEVELS:
+            allowed_courses.setdefault((department_id, semester, year_level), semester_course_ids)
+    maximum_credit_unit = next((setting.get("maximumCreditUnit") for setting in run.tables["SchoolSetting"]
+                                if setting.get("maximumCreditUnit")), DEFAULT_MAXIMUM_CREDIT_UNIT)
+    registration = run.lookups["registration"]
+    lookups = {
+        **registration,
+        "semester_levels": semester_levels,
+        "student_levels": student_levels,
+        "allowed_courses": allowed_courses,
+        "course_credits": course_credits,
+        "maximum_credit_unit": maximum_credit_unit,
+        # The first courses a rule allows are the most popular ones
+        "allowed_weights": {bucket: zipf_weights(len(bucket_course_ids), run.profile["course_skew"])
+                            for bucket, bucket_course_ids in allowed_courses.items()},
+    }
+    return run.sharded("RegistrationEntry", registration["registration_count"], lookups, ids_per_row=MAX_COURSE_LOAD)
+
+
+@phase("Result", depends=["Student", "Course", "Semester"])
+def generate_results(run):
+    # One per student, course and semester at most, as its unique key demands;
+    # every semester comes with its own academic session
+    results = run.start_table("Result")
+    rng = run.rng("Result")
+    student_ids, course_ids, semester_pairs = run.lookup("student_ids"), run.lookup("course_ids"), run.lookup("semester_pairs")
+    result_keys = UniqueKeySampler(
+        [student_ids, course_ids, semester_pairs],
+        ((result.get("studentId"), result.get("courseId"), (result.get("academicSessionId"), result.get("semesterId")))
+         for result in results),
+        rng.getrandbits(64),
+    )
+    lookups = {
+        "student_ids": student_ids,
+        "course_ids": course_ids,
+        "semester_pairs": semester_pairs,
+        "result_keys": result_keys,
+        "recency": run.recency,
+        "grade_curve": run.profile["grade_curve"],
+    }
+    # Never more results than there are free keys
+    return run.sharded("Result", run.capped("Result", result_keys.capacity), lookups, rng)
+
+
+@phase("User", depends=["Student", "Staff"])
+def generate_users(run):
+    users = run.start_table("User")
+    rng = run.rng("User")
+    # Emails are unique case-insensitively, as MySQL compares them
+    existing_emails = {user["email"].lower() for user in users}
+    run.relations.add("User", users)
+    student_ids_for_user = [stu["id"] for stu in run.tables["Student"] if not run.relations.references("User", "studentId", stu["id"])]
+    staff_ids_for_user = [staff["id"] for staff in run.tables["Staff"] if not run.relations.references("User", "staffId", staff["id"])]
+    roles = ["Student", "Staff"]
+    email_suffixes = max(100, run.counts["User"] * 100)  # Keep collisions rare at scale
+    for _ in range(run.counts["User"]):
+        first_name = get_random(["Ivy", "Kevin"], rng)
+        last_name = get_random(["Moore", "Taylor"], rng)
+        if student_ids_for_user or staff_ids_for_user:
+            # Weighted by the students and staff left without an account, so each gets one
+            role = rng.choices(roles, weights=[len(student_ids_for_user), len(staff_ids_for_user)])[0]
+        else:
+            role = get_random(roles, rng)
+        local_part = f"{first_name.lower()}.{last_name.lower()}{rng.randint(1, email_suffixes)}"
+        email = f"{local_part}@school.com"
+        # On a collision, count up a disambiguating suffix, so every user is generated
+        collisions = 1
+        while email in existing_emails:
+            collisions += 1
+            email = f"{local_part}.{collisions}@school.com"
+        new_user = {
+            "id": run.ids.next_id("User"),
+            "email": email,
+            "password": PLACEHOLDER_PASSWORD,  # See PasswordPool
+            "role": role,
+            "studentId": take_random(student_ids_for_user, rng) if role == "Student" else None,
+            "staffId": take_random(staff_ids_for_user, rng) if role == "Staff" else None,
+            "isDeleted": 0,
+            "createdAt": random_date(rng=rng, recency=run.recency)
         }
-      ],
-      "SchoolSetting": [
-        {
-          "id": 7,
-          "name": "Cyberwizdev University",
-          "address": "123 Education Street, Knowledge City, 12345",
-          "currentAcademicSessionId": 2,
-          "semestersPerSession": 2
+        users.append(new_user)
+        run.relations.add("User", [new_user])
+        existing_emails.add(email)
+    return users
+
+
+@phase("Notification", depends=["User"])
+def generate_notifications(run):
+    run.start_table("Notification")
+    lookups = {"user_ids": run.lookup("user_ids"), "recency": run.recency}
+    return run.sharded("Notification", run.counts["Notification"], lookups)
+
+
+@phase("Log")
+def generate_logs(run):
+    # In time order, after the existing logs
+    logs = run.start_table("Log")
+    latest_log = max(filter(None, (parse_timestamp(log.get("createdAt")) for log in logs)), default=None)
+    log_start, log_end = LOG_PERIOD
+    if latest_log is not None and latest_log >= log_start:
+        log_start = latest_log + 1
+        log_end = max(log_end, log_start + 30 * 86400)
+    lookups = {"log_rows": run.counts["Log"], "log_period": (log_start, log_end), "recency": run.recency}
+    return run.sharded("Log", run.counts["Log"], lookups)
+
+
+@phase("NextId", depends=["Staff", "Student"])
+def generate_next_ids(run):
+    # Keep existing - the ID allocator updates them
+    next_ids = run.start_table("NextId")
+    next_id_map = {item["tableName"].lower(): item for item in next_ids}
+    # Table names are the values of the TableName enum in schema.prisma
+    for table_name in ["user", "student", "staff", "course", "result", "academicSession", "semester", "schoolSetting", "notification", "log"]:
+        if table_name.lower() not in next_id_map:
+            next_ids.append({"id": run.ids.next_id("NextId"), "tableName": table_name, "nextId": 1})
+    # The server numbers new staff and student codes from NextId, so continue after the generated ones
+    next_id_map = {item["tableName"].lower(): item for item in next_ids}
+    for table_name, codes, prefix in [("staff", run.lookups["staff_codes"], "STAFF"), ("student", run.lookups["student_codes"], "STU")]:
+        next_id_map[table_name]["nextId"] = max(next_id_map[table_name]["nextId"], codes.last_number(prefix) + 1)
+    return next_ids
+
+
+def schedule_phases(phases):
+    """Order ``phases`` so each comes after the phases of the models it depends on.
+
+    Among the phases ready to run, the one declared first goes first, so the
+    order is stable. Raises ValueError on unknown models or a dependency cycle.
+    """
+    models = {phase.model for phase in phases}
+    for phase in phases:
+        unknown = set(phase.depends) - models
+        if unknown:
+            raise ValueError(f"Phase {phase.model} depends on unknown models {sorted(unknown)}")
+    done, ordered, waiting = set(), [], list(phases)
+    while waiting:
+        ready = next((phase for phase in waiting if done.issuperset(phase.depends)), None)
+        if ready is None:
+            raise ValueError(f"Dependency cycle among the phases of {sorted(phase.model for phase in waiting)}")
+        waiting.remove(ready)
+        ordered.append(ready)
+        done.add(ready.model)
+    return ordered
+
+
+def generate_tables(existing_data, counts=None, workers=1, seed=None, vectorized=False, distribution="uniform",
+                    checkpoint=None, generated=None):
+    """Generate filler data model by model as ``(model, rows)`` pairs.
+
+    ``rows`` starts with the existing rows of the model, followed by the
+    generated ones. Models come in the order of PHASES, after the models
+    they depend on. The large tables (Registration, RegistrationEntry,
+    Result, Notification and Log) are produced lazily, so each ``rows`` must
+    be consumed before moving on to the next model. They are generated in
+    shards across ``workers`` processes, with NumPy if ``vectorized``; with
+    more than one worker, the next large table starts generating while the
+    current one is consumed.
+
+    Values are drawn along the ``distribution`` profile, see
+    DISTRIBUTION_PROFILES. The same ``seed`` always produces the same rows;
+    without one, a random seed is used.
+
+    With a Checkpoint, every model is checkpointed once its rows were
+    consumed. If the checkpoint has models done already, their rows are
+    read back from it and generation picks up after them.
+
+    If given, ``generated`` is filled with the rows generated per model.
+    It falls short of ``counts`` for the models whose unique key has fewer
+    free values than rows requested, which are warned about.
+    """
+    counts = {**SCALE_PROFILES["default"], **(counts or {})}
+    if distribution not in DISTRIBUTION_PROFILES:
+        raise ValueError(f"Unknown distribution profile '{distribution}', expected one of {sorted(DISTRIBUTION_PROFILES)}")
+    if seed is None:
+        seed = new_seed()
+    if vectorized and np is None:
+        raise RuntimeError("Vectorized generation needs NumPy (pip install numpy)")
+    run = GenerationRun(existing_data, counts, seed, workers, vectorized, distribution, generated)
+    phases = deque(schedule_phases(PHASES))
+    if checkpoint is not None and checkpoint.done:
+        run.restore(checkpoint.state)
+        yield from checkpoint.replay()
+        phases = deque(phase for phase in phases if phase.model not in checkpoint.done)
+
+    def build(phase):
+        rows = phase.build(run)
+        # The state after each phase is taken as it is built, as building ahead moves it on
+        return phase.model, rows, run.state() if checkpoint is not None else None
+
+    built = deque()
+    while phases or built:
+        if not built:
+            built.append(build(phases.popleft()))
+        model, rows, state = built.popleft()
+        if workers > 1 and isinstance(rows, ShardedRows):
+            # Build on up to the next sharded table, which then generates while this one is consumed
+            while phases and not any(isinstance(ahead, ShardedRows) for _, ahead, _ in built):
+                built.append(build(phases.popleft()))
+            for table in [rows] + [ahead for _, ahead, _ in built if isinstance(ahead, ShardedRows)]:
+                table.start()
+        yield model, rows if checkpoint is None else checkpoint.track(model, rows, state)
+
+
+class DeltaManifest:
+    """Records what a delta run adds to a snapshot: new rows per model and changed NextId entries."""
+
+    def __init__(self):
+        self.added = {}
+        self.updated = {}
+
+    def track(self, model, rows):
+        added = self.added.setdefault(model, {"rows": 0, "firstId": None, "lastId": None})
+        for row in rows:
+            added["rows"] += 1
+            if added["firstId"] is None:
+                added["firstId"] = row.get("id")
+            added["lastId"] = row.get("id")
+            yield row
+
+    def as_dict(self):
+        return {"added": self.added, "updated": self.updated}
+
+
+def iter_filler_data(existing_data, counts=None, workers=1, seed=None, vectorized=False, manifest=None, snapshot=None,
+                     distribution="uniform", checkpoint=None, generated=None):
+    """Generate filler data model by model as ``(model, rows)`` pairs, see ``generate_tables``.
+
+    With a DeltaManifest, only the newly generated rows of each model are
+    emitted, with IDs past the snapshot's high-water marks, and the manifest
+    records them. NextId entries the run advanced are recorded as updates.
+
+    When ``existing_data`` was loaded by a SnapshotReader, pass it as
+    ``snapshot`` so the existing rows of the models it trimmed are streamed
+    back from the snapshot whole. A Checkpoint and ``generated`` are passed on
+    to ``generate_tables``.
+    """
+    existing_counts = {model: len(rows) for model, rows in existing_data.items()}
+    next_ids_before = {entry["id"]: entry["nextId"] for entry in existing_data.get("NextId", [])}
+    for model, rows in generate_tables(existing_data, counts, workers, seed, vectorized, distribution, checkpoint,
+                                       generated):
+        if manifest is not None:
+            yield model, manifest.track(model, islice(rows, existing_counts.get(model, 0), None))
+        elif snapshot is not None and SNAPSHOT_COLUMNS.get(model):
+            yield model, chain(snapshot.rows(model), islice(rows, existing_counts.get(model, 0), None))
+        else:
+            yield model, rows
+    if manifest is None:
+        return
+    changed = [entry for entry in existing_data.get("NextId", []) if entry["nextId"] != next_ids_before[entry["id"]]]
+    if changed:
+        manifest.updated["NextId"] = changed
+
+
+class PhaseProfiler:
+    """Measures each model phase of a generation run, see ``wrap``.
+
+    A phase runs from the request for its ``(model, rows)`` pair until its
+    rows are exhausted, so it covers generating the rows and whatever the
+    consumer does with them, such as writing them out. For each phase the
+    summary has its wall and CPU time, rows, rows/sec and the allocator
+    PROBES made during it. The ``profile_phase`` model is also run under
+    cProfile and the ``trace_phase`` model (``"*"`` for every phase) under
+    tracemalloc. Only this process is measured, not the shard workers.
+    """
+
+    def __init__(self, profile_phase=None, trace_phase=None, top=15):
+        self.profile_phase = profile_phase
+        self.trace_phase = trace_phase
+        self.top = top
+        self.phases = []
+        self.wall_time = self.cpu_time = 0.0
+
+    def _traced(self, model):
+        return self.trace_phase in ("*", model)
+
+    def wrap(self, tables):
+        """Yield the ``(model, rows)`` pairs of ``tables``, measuring each phase."""
+        tables = iter(tables)
+        run_started, run_cpu_started = time.perf_counter(), time.process_time()
+        profile = None
+        while True:
+            started, cpu_started, probes = time.perf_counter(), time.process_time(), PROBES.copy()
+            # The phase is only known once its pair arrives, so every phase
+            # starts out traced and profiled when any is
+            if self.trace_phase:
+                tracemalloc.start()
+                tracemalloc.reset_peak()
+            if self.profile_phase:
+                profile = cProfile.Profile()
+                profile.enable()
+            try:
+                model, rows = next(tables)
+            except StopIteration:
+                if profile:
+                    profile.disable()
+                if self.trace_phase:
+                    tracemalloc.stop()
+                break
+            if profile and model != self.profile_phase:
+                profile.disable()
+                profile = None
+            if self.trace_phase and not self._traced(model):
+                tracemalloc.stop()
+
+            phase = {"model": model, "rows": 0}
+            yield model, self._count(rows, phase)
+
+            phase["seconds"] = round(time.perf_counter() - started, 4)
+            phase["cpuSeconds"] = round(time.process_time() - cpu_started, 4)
+            phase["rowsPerSec"] = round(phase["rows"] / phase["seconds"]) if phase["seconds"] else None
+            phase["probes"] = dict(PROBES - probes)
+            if self._traced(model):
+                phase["peakTracedMb"] = round(tracemalloc.get_traced_memory()[1] / (1024 * 1024), 1)
+                phase["topAllocations"] = [
+                    {"site": str(stat.traceback), "kb": round(stat.size / 1024, 1), "blocks": stat.count}
+                    for stat in tracemalloc.take_snapshot().statistics("lineno")[:5]
+                ]
+                tracemalloc.stop()
+            if profile:
+                profile.disable()
+                phase["profile"] = self._top_functions(profile)
+                profile = None
+            self.phases.append(phase)
+        self.wall_time = time.perf_counter() - run_started
+        self.cpu_time = time.process_time() - run_cpu_started
+
+    @staticmethod
+    def _count(rows, phase):
+        for row in rows:
+            phase["rows"] += 1
+            yield row
+
+    def _top_functions(self, profile):
+        stats = pstats.Stats(profile)
+        entries = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:self.top]
+        return [
+            {"function": f"{path}:{line}({name})", "calls": calls, "tottime": round(tottime, 4), "cumtime": round(cumtime, 4)}
+            for (path, line, name), (_, calls, tottime, cumtime, _) in entries
+        ]
+
+    def summary(self):
+        """Return the measurements of the finished run as a JSON-serializable dict."""
+        hottest = max(self.phases, key=lambda phase: phase["seconds"], default=None)
+        return {
+            "wallSeconds": round(self.wall_time, 4),
+            "cpuSeconds": round(self.cpu_time, 4),
+            "rows": sum(phase["rows"] for phase in self.phases),
+            "hottestPhase": hottest["model"] if hottest else None,
+            "phases": self.phases,
         }
-      ],
-      "AcademicSession": [
-        {
-          "id": 1,
-          "name": "2023/2024"
-        },
-        {
-          "id": 2,
-          "name": "2024/2025"
+
+
+def generate_filler_data(existing_data, counts=None, workers=1, seed=None, vectorized=False, profiler=None,
+                         distribution="uniform"):
+    """Generate the filler data for every model in memory, as model name -> rows."""
+    tables = iter_filler_data(existing_data, counts, workers, seed, vectorized, distribution=distribution)
+    if profiler is not None:
+        tables = profiler.wrap(tables)
+    return {model: list(rows) for model, rows in tables}
+
+
+def pool_password(index):
+    """The plain-text password of the ``index``-th pair of a PasswordPool."""
+    return f"Seed-{index:05d}-Pass"
+
+
+def hash_password(password, cost=BCRYPT_COST):
+    # bcryptjs writes $2a$ hashes; keep to them
+    return bcrypt.hashpw(password.encode(), bcrypt.gensalt(cost, prefix=b"2a")).decode()
+
+
+def hash_passwords(passwords, cost=BCRYPT_COST, workers=1):
+    """bcrypt hash every password, across ``workers`` processes."""
+    if workers == 1:
+        return [hash_password(password, cost) for password in passwords]
+    with ProcessPoolExecutor(workers) as pool:
+        chunk_size = max(1, len(passwords) // (workers * 4))
+        return list(pool.map(hash_password, passwords, repeat(cost), chunksize=chunk_size))
+
+
+class PasswordPool:
+    """Valid bcrypt ``(password, hash)`` pairs to give generated users, so they can log in.
+
+    Hashing at the server's cost takes tens of milliseconds per password, so
+    users share a pool of ``size`` pairs rather than getting one each. The
+    pairs are cached in ``cache_path`` across runs, and only the ones missing
+    from the cache are hashed, across ``workers`` processes. Salts are random,
+    so the same seed gives the same users the same passwords, but the same
+    hashes only with the same cache.
+    """
+
+    def __init__(self, size, cost=BCRYPT_COST, cache_path=PASSWORD_CACHE):
+        if size < 1:
+            raise ValueError("A password pool needs at least one password")
+        self.size = size
+        self.cost = cost
+        self.cache_path = cache_path
+        self.pairs = []
+        self.credentials = []
+
+    def _read_cache(self):
+        try:
+            with open(self.cache_path) as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return []
+        if cache.get("cost") != self.cost:
+            return []
+        pairs = []
+        for index, (password, hashed) in enumerate(cache.get("pairs", [])):
+            if password != pool_password(index):
+                break
+            pairs.append((password, hashed))
+        return pairs
+
+    def load(self, workers=1):
+        """Fill the pool from the cache, hashing and caching whatever it lacks."""
+        cached = self._read_cache()
+        self.pairs = cached[:self.size]
+        missing = [pool_password(index) for index in range(len(self.pairs), self.size)]
+        if missing:
+            if bcrypt is None:
+                raise RuntimeError(f"Hashing {len(missing)} passwords needs bcrypt (pip install bcrypt)")
+            self.pairs += zip(missing, hash_passwords(missing, self.cost, workers))
+            os.makedirs(os.path.dirname(os.path.abspath(self.cache_path)), exist_ok=True)
+            with open(self.cache_path, "w") as f:
+                json.dump({"cost": self.cost, "pairs": self.pairs}, f)
+        return self
+
+    def wrap(self, tables, seed):
+        """Pass ``(model, rows)`` pairs through, giving the generated users passwords of the pool.
+
+        Users keep their pair in ``credentials``, as ``(email, password, role)``.
+        """
+        for model, rows in tables:
+            yield model, (self._assign(rows, table_rng(seed, "User.password")) if model == "User" else rows)
+
+    def _assign(self, rows, rng):
+        for row in rows:
+            if row.get("password") == PLACEHOLDER_PASSWORD:
+                password, hashed = self.pairs[rng.randrange(len(self.pairs))]
+                row = {**row, "password": hashed}
+                self.credentials.append((row["email"], password, row["role"]))
+            yield row
+
+    def write_credentials(self, path):
+        """Write the credentials of the users given passwords as CSV, for load-test clients."""
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["email", "password", "role"])
+            writer.writerows(self.credentials)
+
+
+# Requests of a load-test workload against the Express API, by endpoint:
+# method, path and the role of the clients sending it (None for any)
+WORKLOAD_ENDPOINTS = {
+    "login": ("POST", "/api/auth/login", None),
+    "results": ("GET", "/api/results/student/{studentId}", "Student"),
+    "register": ("POST", "/api/students/courses/register", "Student"),
+    "registered": ("GET", "/api/students/courses/registered", "Student"),
+    "courses": ("GET", "/api/courses?departmentId={departmentId}", None),
+    "departments": ("GET", "/api/departments", None),
+    "faculties": ("GET", "/api/faculties", None),
+    "logs": ("GET", "/api/logs?page={page}&limit={limit}", "Admin"),
+}
+WORKLOAD_MIX = {
+    "login": 10, "results": 30, "register": 10, "registered": 10,
+    "courses": 15, "departments": 10, "faculties": 10, "logs": 5,
+}
+# Users sampled as the clients of a workload, and log entries per page of /api/logs
+WORKLOAD_CLIENTS = 10_000
+LOG_PAGE_SIZE = 10
+
+
+class Workload:
+    """A load-test request trace against the generated data, replayable by a load driver.
+
+    ``wrap`` records the entities the requests reference as the tables
+    stream past: clients sampled among the users given a password of the
+    PasswordPool, with their student and department, and the IDs of
+    departments, courses and the current session. ``write`` then draws
+    ``requests`` requests along ``mix``, arriving as a Poisson process of
+    ``rate`` requests per second. Clients, departments and log pages are
+    picked with Zipf weights of exponent ``skew``, so a few of them get
+    most of the requests. Admin requests need ``admin`` credentials, as
+    ``(email, password)``; without them, they are left out of the mix.
+    """
+
+    def __init__(self, passwords, requests=10_000, rate=50.0, mix=None, skew=1.0, admin=None,
+                 max_clients=WORKLOAD_CLIENTS):
+        self.passwords = {hashed: password for password, hashed in passwords.pairs}
+        self.requests = requests
+        self.rate = rate
+        self.mix = dict(WORKLOAD_MIX if mix is None else mix)
+        self.skew = skew
+        self.admin = admin
+        self.max_clients = max_clients
+        self.clients = []
+        self.users_seen = 0
+        self.student_departments = {}
+        self.department_courses = {}
+        self.department_ids = []
+        self.session_ids = []
+        self.current = (None, 0)
+        self.log_rows = 0
+
+    def wrap(self, tables, seed):
+        """Pass ``(model, rows)`` pairs through, recording what the requests will reference."""
+        self.rng = table_rng(seed, "Workload")
+        for model, rows in tables:
+            record = getattr(self, f"_record_{model.lower()}", None)
+            yield model, (rows if record is None else self._record(record, rows))
+
+    def _record(self, record, rows):
+        for row in rows:
+            record(row)
+            yield row
+
+    def _record_department(self, row):
+        self.department_ids.append(row["id"])
+
+    def _record_course(self, row):
+        self.department_courses.setdefault(row.get("departmentId"), []).append(row["id"])
+
+    def _record_academicsession(self, row):
+        self.session_ids.append(row["id"])
+
+    def _record_schoolsetting(self, row):
+        self.current = (row.get("currentAcademicSessionId"), row.get("currentSemester") or 0)
+
+    def _record_student(self, row):
+        self.student_departments[row["id"]] = row.get("departmentId")
+
+    def _record_log(self, row):
+        self.log_rows += 1
+
+    def _record_user(self, row):
+        password = self.passwords.get(row.get("password"))
+        if password is None:
+            return
+        client = {"email": row["email"], "password": password, "role": row["role"]}
+        if row["role"] == "Student" and row.get("studentId") is not None:
+            client["studentId"] = row["studentId"]
+            client["departmentId"] = self.student_departments.get(row["studentId"])
+        # Reservoir sampling, so every user is as likely to be a client
+        self.users_seen += 1
+        if len(self.clients) < self.max_clients:
+            self.clients.append(client)
+        else:
+            index = self.rng.randrange(self.users_seen)
+            if index < self.max_clients:
+                self.clients[index] = client
+
+    def _draws(self):
+        """Return the cumulative weights of the endpoints of the mix that have clients to send them."""
+        students = [index for index, client in enumerate(self.clients) if "studentId" in client]
+        senders = {
+            None: list(range(len(self.clients))),
+            "Student": students,
+            "Admin": [len(self.clients)] if self.admin else [],
         }
-      ]
+        endpoints = [endpoint for endpoint, weight in self.mix.items() if weight > 0
+                     and senders[WORKLOAD_ENDPOINTS[endpoint][2]]]
+        if not endpoints:
+            raise ValueError("No endpoint of the workload mix has clients to send it")
+        cum_weights, total = [], 0
+        for endpoint in endpoints:
+            total += self.mix[endpoint]
+            cum_weights.append(total)
+        return endpoints, cum_weights, senders
+
+    def _request(self, endpoint, senders, weights):
+        method, path, role = WORKLOAD_ENDPOINTS[endpoint]
+        client = get_weighted(senders[role], weights[role], self.rng)
+        request = {"client": client, "endpoint": endpoint, "method": method}
+        body = None
+        values = {"limit": LOG_PAGE_SIZE}
+        if endpoint == "login":
+            body = {"email": self.clients[client]["email"], "password": self.clients[client]["password"]}
+        elif role == "Student":
+            values["studentId"] = self.clients[client]["studentId"]
+        if endpoint == "courses":
+            values["departmentId"] = get_weighted(self.department_ids, weights["departments"], self.rng)
+        elif endpoint == "logs":
+            pages = max(1, -(-self.log_rows // LOG_PAGE_SIZE))
+            values["page"] = get_weighted(range(1, pages + 1), weights["pages"], self.rng)
+        elif endpoint == "register":
+            session_id, semester = self.current
+            courses = self.department_courses.get(self.clients[client].get("departmentId")) or self.course_ids
+            body = {
+                "courseIds": self.rng.sample(courses, min(len(courses), self.rng.randint(*COURSE_LOAD))),
+                "academicSessionId": session_id if session_id is not None else max(self.session_ids, default=None),
+                "semester": COURSE_SEMESTERS[min(semester, len(COURSE_SEMESTERS) - 1)],
+            }
+        request["path"] = path.format(**values)
+        request["body"] = body
+        return request
+
+    def write(self, path, seed):
+        """Write the trace as NDJSON: a header with the clients, then one request per line in time order.
+
+        Every request names the index of its client in the header's
+        ``clients``; the admin, if any, comes last. ``t`` is the time of
+        the request in seconds from the start of the replay.
+        """
+        endpoints, endpoint_weights, senders = self._draws()
+        self.course_ids = [course for courses in self.department_courses.values() for course in courses]
+        weights = {role: zipf_weights(len(indexes), self.skew) for role, indexes in senders.items()}
+        weights["departments"] = zipf_weights(len(self.department_ids), self.skew)
+        weights["pages"] = zipf_weights(max(1, -(-self.log_rows // LOG_PAGE_SIZE)), self.skew)
+        clients = self.clients + ([{"email": self.admin[0], "password": self.admin[1], "role": "Admin"}]
+                                  if self.admin else [])
+        header = {"seed": seed, "requests": self.requests, "rate": self.rate, "skew": self.skew,
+                  "mix": {endpoint: self.mix[endpoint] for endpoint in endpoints}, "clients": clients}
+        with open(path, "w", buffering=1 << 20) as f:
+            f.write(dump_row(header))
+            f.write("\n")
+            now = 0.0
+            for _ in range(self.requests):
+                now += self.rng.expovariate(self.rate)
+                endpoint = get_weighted(endpoints, endpoint_weights, self.rng)
+                f.write(dump_row({"t": round(now, 6), **self._request(endpoint, senders, weights)}))
+                f.write("\n")
+
+
+def dump_row(row):
+    return json.dumps(row, separators=(",", ":"))
+
+
+def row_lines(rows):
+    """Return the serialized rows of a table: as stored for a CachedTable, else through ``dump_row``."""
+    return rows.lines() if isinstance(rows, CachedTable) else map(dump_row, rows)
+
+
+class DatasetFingerprint:
+    """SHA-256 of the serialized rows, per model and for the whole dataset.
+
+    The rows are hashed exactly as ``dump_row`` serializes them, so the
+    fingerprint does not depend on the output format.
+    """
+
+    def __init__(self):
+        self.hashes = {}
+        self.rows = {}
+
+    def add(self, model, line):
+        if model not in self.hashes:
+            self.hashes[model] = hashlib.sha256()
+            self.rows[model] = 0
+        self.hashes[model].update(line.encode())
+        self.hashes[model].update(b"\n")
+        self.rows[model] += 1
+
+    def table_digests(self):
+        return {model: digest.hexdigest() for model, digest in self.hashes.items()}
+
+    def digest(self):
+        summary = "".join(f"{model}:{digest}\n" for model, digest in sorted(self.table_digests().items()))
+        return hashlib.sha256(summary.encode()).hexdigest()
+
+
+def fingerprint_tables(tables):
+    """Return the DatasetFingerprint of ``(model, rows)`` pairs without writing them anywhere."""
+    fingerprint = DatasetFingerprint()
+    for model, rows in tables:
+        for line in row_lines(rows):
+            fingerprint.add(model, line)
+    return fingerprint
+
+
+def write_json(tables, output_filename, fingerprint=None):
+    """Stream ``(model, rows)`` pairs into one compact JSON document of model name -> rows."""
+    with open(output_filename, "w", buffering=1 << 20) as f:
+        f.write("{")
+        for table_index, (model, rows) in enumerate(tables):
+            f.write(",\n" if table_index else "\n")
+            f.write(f"{json.dumps(model)}: [")
+            for row_index, line in enumerate(row_lines(rows)):
+                if fingerprint is not None:
+                    fingerprint.add(model, line)
+                f.write(",\n" if row_index else "\n")
+                f.write(line)
+            f.write("\n]")
+        f.write("\n}\n")
+
+
+def write_ndjson(tables, output_dir, fingerprint=None):
+    """Stream ``(model, rows)`` pairs into one ``<model>.ndjson`` file per model."""
+    os.makedirs(output_dir, exist_ok=True)
+    for model, rows in tables:
+        with open(os.path.join(output_dir, f"{model}.ndjson"), "w", buffering=1 << 20) as f:
+            for line in row_lines(rows):
+                if fingerprint is not None:
+                    fingerprint.add(model, line)
+                f.write(line)
+                f.write("\n")
+
+
+def csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, (dict, list)):
+        return dump_row(value)
+    return value
+
+
+def write_csv(tables, output_dir, fingerprint=None):
+    """Stream ``(model, rows)`` pairs into one ``<model>.csv`` file per model.
+
+    The header is the columns of the first row of each model; NULLs are
+    written as empty fields and booleans as 0 and 1.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    for model, rows in tables:
+        with open(os.path.join(output_dir, f"{model}.csv"), "w", newline="", buffering=1 << 20) as f:
+            writer = csv.writer(f)
+            columns = None
+            for row in rows:
+                if fingerprint is not None:
+                    fingerprint.add(model, dump_row(row))
+                if columns is None:
+                    columns = list(row)
+                    writer.writerow(columns)
+                writer.writerow([csv_value(row.get(column)) for column in columns])
+
+
+def metadata_path(output, output_format):
+    """Return where the metadata of an output written in ``output_format`` goes."""
+    return os.path.join(output, "_meta.json") if output_format != "json" else f"{os.path.splitext(output)[0]}.meta.json"
+
+
+def write_metadata(path, seed, counts, fingerprint, snapshot=None, manifest=None, distribution="uniform", generated=None):
+    """Record what produced a dataset, so benchmark results can be tied to it.
+
+    ``counts`` are the rows requested per model and ``generated`` the rows
+    generated, fewer where a unique key ran out of free values.
+    """
+    metadata = {
+        "seed": seed,
+        "counts": counts,
+        "generated": counts if generated is None else generated,
+        "distribution": distribution,
+        "snapshot": snapshot,
+        "rows": fingerprint.rows,
+        "fingerprint": fingerprint.digest(),
+        "tableFingerprints": fingerprint.table_digests(),
+    }
+    if manifest is not None:
+        metadata["delta"] = manifest.as_dict()
+    with open(path, "w") as f:
+        json.dump(metadata, f, indent=2)
+
+
+def file_digest(path):
+    """Return the SHA-256 of the contents of ``path``."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(SNAPSHOT_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class CachedTable:
+    """The rows of one model of a cached dataset, read from disk as stored.
+
+    ``<model>.ndjson`` holds the rows as ``dump_row`` serialized them, one
+    per line, and ``<model>.idx`` the byte offset of each line followed by
+    the end of the file, as native int64s. Both are memory-mapped, so any
+    row can be read by its index without parsing the others, and ``lines``
+    streams the rows without decoding them at all.
+    """
+
+    def __init__(self, entry_dir, model):
+        self.model = model
+        self.path = os.path.join(entry_dir, f"{model}.ndjson")
+        self.index_path = os.path.join(entry_dir, f"{model}.idx")
+
+    def __len__(self):
+        return max(0, os.path.getsize(self.index_path) // 8 - 1)
+
+    def _open(self, path):
+        with open(path, "rb") as f:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __getitem__(self, index):
+        if not -len(self) <= index < len(self):
+            raise IndexError(f"{self.model} has no row {index}")
+        index %= len(self)
+        offsets = array("q")
+        with self._open(self.index_path) as index_map:
+            offsets.frombytes(index_map[index * 8:index * 8 + 16])
+        with self._open(self.path) as data:
+            return json.loads(data[offsets[0]:offsets[1] - 1])
+
+    def lines(self):
+        """Yield the serialized rows, without their trailing newlines."""
+        if not len(self):
+            return
+        with self._open(self.path) as data:
+            start = 0
+            while start < len(data):
+                end = data.find(b"\n", start)
+                yield data[start:end].decode()
+                start = end + 1
+
+    def __iter__(self):
+        return map(json.loads, self.lines())
+
+
+def store_table(directory, model, rows):
+    """Pass ``rows`` through, storing them in ``directory`` to be read back as a CachedTable."""
+    offsets = array("q", [0])
+    with open(os.path.join(directory, f"{model}.ndjson"), "wb", buffering=1 << 20) as f:
+        for row in rows:
+            line = dump_row(row).encode()
+            f.write(line)
+            f.write(b"\n")
+            offsets.append(offsets[-1] + len(line) + 1)
+            yield row
+    with open(os.path.join(directory, f"{model}.idx"), "wb") as f:
+        offsets.tofile(f)
+
+
+class DatasetCache:
+    """Generated datasets kept on disk, keyed by everything their rows depend on.
+
+    Each entry is a directory named after its key, holding a CachedTable per
+    model and ``_meta.json`` with the model order, the inputs of the key and
+    the delta manifest of the run. As the tables are NDJSON files, an entry
+    can also be loaded with seedLoader.py as it is. Once the entries take
+    more than ``max_bytes``, the least recently used ones are evicted; a hit
+    marks an entry used by touching its ``_meta.json``.
+    """
+
+    def __init__(self, root, max_bytes=DATASET_CACHE_MB << 20):
+        self.root = root
+        self.max_bytes = max_bytes
+
+    KEY_PATTERN = re.compile(r"[0-9a-f]{32}")
+
+    @staticmethod
+    def key(inputs):
+        return hashlib.sha256(json.dumps(inputs, sort_keys=True).encode()).hexdigest()[:32]
+
+    def entry_dir(self, key):
+        return os.path.join(self.root, key)
+
+    def load(self, key):
+        """Return the ``(model, CachedTable)`` pairs and metadata cached under ``key``, or None."""
+        meta_path = metadata_path(self.entry_dir(key), "ndjson")
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        os.utime(meta_path)
+        return [(model, CachedTable(self.entry_dir(key), model)) for model in meta["models"]], meta
+
+    def store(self, key, tables, inputs, manifest=None, generated=None):
+        """Pass ``(model, rows)`` pairs through, caching them under ``key`` once all were consumed.
+
+        A run that stops early leaves nothing behind. The manifest of a delta
+        run and the ``generated`` row counts are read after the last table,
+        when they are complete.
+        """
+        os.makedirs(self.root, exist_ok=True)
+        staging = f"{self.entry_dir(key)}.tmp-{os.getpid()}"
+        os.makedirs(staging, exist_ok=True)
+        models = []
+        try:
+            for model, rows in tables:
+                models.append(model)
+                yield model, store_table(staging, model, rows)
+            meta = {"key": key, "models": models, "inputs": inputs}
+            if generated is not None:
+                meta["generated"] = generated
+            if manifest is not None:
+                meta["delta"] = manifest.as_dict()
+            with open(metadata_path(staging, "ndjson"), "w") as f:
+                json.dump(meta, f, indent=2)
+            try:
+                os.rename(staging, self.entry_dir(key))
+            except OSError:  # Cached meanwhile by a concurrent run
+                pass
+            else:
+                self.evict(keep=key)
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+    def entries(self):
+        """Return ``(last used, bytes, key)`` for every complete entry.
+
+        Only directories named like a key, whose ``_meta.json`` was written
+        for that key, are entries; anything else under the root is left be.
+        """
+        entries = []
+        for key in os.listdir(self.root):
+            if not self.KEY_PATTERN.fullmatch(key):
+                continue
+            meta_path = metadata_path(self.entry_dir(key), "ndjson")
+            try:
+                with open(meta_path) as f:
+                    if json.load(f).get("key") != key:
+                        continue
+            except (OSError, ValueError, AttributeError):
+                continue
+            size = sum(entry.stat().st_size for entry in os.scandir(self.entry_dir(key)))
+            entries.append((os.path.getmtime(meta_path), size, key))
+        return entries
+
+    def evict(self, keep=None):
+        """Remove the least recently used entries until the rest fit in ``max_bytes``."""
+        entries = sorted(self.entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, key in entries:
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            shutil.rmtree(self.entry_dir(key), ignore_errors=True)
+            total -= size
+
+
+def dataset_inputs(args, seed):
+    """Return what a dataset generated with ``args`` depends on, to key a DatasetCache or Checkpoint with.
+
+    Worker counts do not change the rows, so they are left out. Passwords
+    are given after the cache, so they are left out too.
+    """
+    return {
+        "seed": seed,
+        "counts": args.counts,
+        "distribution": args.distribution,
+        "numpy": args.numpy,
+        "delta": args.delta,
+        "snapshot": file_digest(args.snapshot),
+        "schema": file_digest(SCHEMA_PATH),
+        "generator": file_digest(os.path.abspath(__file__)),
     }
 
-    filler_data = generate_filler_data(existing_data)
-    output_filename = "filler_data_output.json"
-    with open(output_filename, 'w') as f:
-        json.dump(filler_data, f, indent=2)
-    print(f"Filler data successfully saved to {output_filename}")
\ No newline at end of file
+
+class Checkpoint:
+    """Persists a generation run phase by phase, so an interrupted run can be resumed.
+
+    Once all rows of a model were consumed, they are stored in ``directory``
+    as a CachedTable, and ``checkpoint.pickle`` records the models done so
+    far with the state of the GenerationRun right after the last of them was
+    built, see ``GenerationRun.state``. Each phase draws from its own
+    table_rng, so that is all the later phases need. A checkpoint is only
+    resumed with the ``inputs`` it was written with.
+    """
+
+    STATE_FILE = "checkpoint.pickle"
+
+    def __init__(self, directory, inputs):
+        self.directory = directory
+        self.inputs = inputs
+        self.done = []
+        self.state = None
+
+    def state_path(self):
+        return os.path.join(self.directory, self.STATE_FILE)
+
+    def load(self):
+        """Pick up the saved checkpoint, if any, and return the models it has done."""
+        try:
+            with open(self.state_path(), "rb") as f:
+                saved = pickle.load(f)
+        except FileNotFoundError:
+            return []
+        if saved["inputs"] != self.inputs:
+            changed = sorted(key for key in {**saved["inputs"], **self.inputs}
+                             if saved["inputs"].get(key) != self.inputs.get(key))
+            raise ValueError(f"The checkpoint in {self.directory} was written with other inputs: {', '.join(changed)}")
+        self.done, self.state = saved["done"], saved["state"]
+        return self.done
+
+    def reset(self):
+        """Start over, forgetting any saved checkpoint."""
+        os.makedirs(self.directory, exist_ok=True)
+        if os.path.exists(self.state_path()):
+            os.remove(self.state_path())
+        self.done, self.state = [], None
+
+    def track(self, model, rows, state):
+        """Pass ``rows`` through, checkpointing ``model`` with ``state`` once they were all consumed."""
+        yield from store_table(self.directory, model, rows)
+        self.done = self.done + [model]
+        self.state = state
+        staging = f"{self.state_path()}.tmp"
+        with open(staging, "wb") as f:
+            pickle.dump({"inputs": self.inputs, "done": self.done, "state": state}, f, pickle.HIGHEST_PROTOCOL)
+        os.replace(staging, self.state_path())
+
+    def replay(self):
+        """Return the ``(model, CachedTable)`` pairs of the models done."""
+        return [(model, CachedTable(self.directory, model)) for model in self.done]
+
+    def clear(self):
+        """Remove the files the checkpoint wrote, and its directory if nothing else is left in it."""
+        paths = [self.state_path(), f"{self.state_path()}.tmp"]
+        paths += [os.path.join(self.directory, f"{phase.model}{extension}")
+                  for phase in PHASES for extension in (".ndjson", ".idx")]
+        for path in paths:
+            if os.path.exists(path):
+                os.remove(path)
+        try:
+            os.rmdir(self.directory)
+        except OSError:  # Holds files of the user's
+            pass
+
+
+class JsonStream:
+    """Incremental reader for the values of a large JSON document, one at a time.
+
+    Only as much of the file as the value being decoded is kept in memory.
+    """
+
+    WHITESPACE = re.compile(r"\s*")
+    SEPARATOR = re.compile(r"\s*([,\]])\s*")
+    DECODER = json.JSONDecoder()
+
+    def __init__(self, f, chunk_size=SNAPSHOT_CHUNK_SIZE):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.seek(f.tell())
+
+    def seek(self, offset):
+        self.f.seek(offset)
+        self.decoder = codecs.getincrementaldecoder("utf-8")()
+        self.buffer, self.pos, self.buffer_offset, self.eof = "", 0, offset, False
+
+    def tell(self):
+        """Return the byte offset of the next unread character."""
+        return self.buffer_offset + len(self.buffer[:self.pos].encode())
+
+    def _fill(self):
+        if self.eof:
+            return False
+        chunk = self.f.read(self.chunk_size)
+        self.eof = not chunk
+        self.buffer_offset = self.tell()
+        self.buffer = self.buffer[self.pos:] + self.decoder.decode(chunk, final=self.eof)
+        self.pos = 0
+        return not self.eof
+
+    def peek(self):
+        while True:
+            self.pos = self.WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer) or not self._fill():
+                return self.buffer[self.pos:self.pos + 1]
+
+    def consume(self, char):
+        if self.peek() != char:
+            return False
+        self.pos += 1
+        return True
+
+    def expect(self, char):
+        if not self.consume(char):
+            raise ValueError(f"Expected '{char}' at byte {self.tell()} of {self.f.name}")
+
+    def value(self):
+        if self.pos == len(self.buffer) or self.buffer[self.pos].isspace():
+            self.peek()
+        while True:
+            try:
+                value, end = self.DECODER.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # A number running up to the end of the buffer may continue in the next chunk
+            if end < len(self.buffer) or not self._fill():
+                self.pos = end
+                return value
+
+    def array(self):
+        self.expect("[")
+        if self.consume("]"):
+            return
+        while True:
+            yield self.value()
+            # Fast path for a separator already in the buffer, as it is between most rows
+            separator = self.SEPARATOR.match(self.buffer, self.pos)
+            if separator and separator.end() < len(self.buffer):
+                self.pos = separator.end()
+                if separator.group(1) == "]":
+                    return
+            elif self.consume("]"):
+                return
+            else:
+                self.expect(",")
+
+
+class SnapshotReader:
+    """Streams a ``saveDbToJson.ts`` backup table by table, keyed by model name.
+
+    The backup is keyed by Prisma client property (``user``, ``hOD``,
+    ``academicSession``), which is the model name with a lowercase first letter.
+    ``load`` keeps only the ``columns`` the generator reads; ``rows`` streams
+    the whole rows of a table again when they are written out.
+    """
+
+    def __init__(self, path, columns=SNAPSHOT_COLUMNS):
+        self.path = path
+        self.columns = columns
+        self.offsets = {}
+
+    def tables(self):
+        """Yield ``(model, rows)`` for each table, each ``rows`` to be consumed before the next."""
+        with open(self.path, "rb") as f:
+            stream = JsonStream(f)
+            stream.expect("{")
+            first = True
+            while not stream.consume("}"):
+                if not first:
+                    stream.expect(",")
+                first = False
+                key = stream.value()
+                stream.expect(":")
+                model = key[:1].upper() + key[1:]
+                self.offsets[model] = stream.tell()
+                rows = stream.array()
+                yield model, rows
+                for _ in rows:  # Skip whatever the caller left unread
+                    pass
+
+    def load(self):
+        """Return the existing data the generator needs, as model name -> trimmed rows."""
+        existing_data = {}
+        for model, rows in self.tables():
+            if model not in self.columns:
+                continue
+            columns = self.columns[model]
+            if columns is None:
+                existing_data[model] = list(rows)
+            else:
+                existing_data[model] = [{column: row[column] for column in columns if column in row} for row in rows]
+        return existing_data
+
+    def rows(self, model):
+        """Stream the whole rows of ``model``; only valid once ``load`` has run."""
+        if model not in self.offsets:
+            return
+        with open(self.path, "rb") as f:
+            stream = JsonStream(f)
+            stream.seek(self.offsets[model])
+            yield from stream.array()
+
+
+def load_snapshot(path=SAMPLE_SNAPSHOT):
+    """Load the existing data the generator needs from a ``saveDbToJson.ts`` backup."""
+    return SnapshotReader(path).load()
+
+
+WRITERS = {
+    "json": write_json,
+    "ndjson": write_ndjson,
+    "csv": write_csv,
+}
+
+
+def parse_count(value):
+    model, sep, rows = value.partition("=")
+    if not sep or not rows.isdigit():
+        raise argparse.ArgumentTypeError(f"expected MODEL=ROWS, got '{value}'")
+    return model, int(rows)
+
+
+def parse_mix(value):
+    mix = {}
+    for part in value.split(","):
+        endpoint, sep, weight = part.partition("=")
+        if not sep or endpoint not in WORKLOAD_ENDPOINTS or not weight.isdigit():
+            raise argparse.ArgumentTypeError(
+                f"expected ENDPOINT=WEIGHT,... with endpoints among {', '.join(WORKLOAD_ENDPOINTS)}, got '{part}'")
+        mix[endpoint] = int(weight)
+    return mix
+
+
+def parse_credentials(value):
+    email, sep, password = value.partition(":")
+    if not sep:
+        raise argparse.ArgumentTypeError(f"expected EMAIL:PASSWORD, got '{value}'")
+    return email, password
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Generate filler data for the school database.")
+    parser.add_argument("--scale", choices=list(SCALE_PROFILES), default="default",
+                        help="Scale profile to take the per-model row counts from")
+    parser.add_argument("--count", type=parse_count, action="append", default=[], metavar="MODEL=ROWS",
+                        help="Override the row count of one model, e.g. --count Result=1000000 (repeatable)")
+    parser.add_argument("--seed", type=int, help="Seed of the generated dataset (default: a random seed)")
+    parser.add_argument("--distribution", choices=list(DISTRIBUTION_PROFILES), default="uniform",
+                        help="Distribution profile of the generated values: uniform, or production for skewed "
+                             "department and course popularity, recent dates and grades following scores")
+    parser.add_argument("--snapshot", default=SAMPLE_SNAPSHOT,
+                        help="db_backup.json written by saveDbToJson.ts to build on (default: sample_db_backup.json)")
+    parser.add_argument("--delta", action="store_true",
+                        help="Only emit the rows generated on top of the snapshot, and record them in the metadata")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Processes to generate the shards of the large tables with")
+    parser.add_argument("--numpy", action="store_true",
+                        help="Generate Registration, Result and Log columns with NumPy (needs numpy installed)")
+    parser.add_argument("--format", choices=list(WRITERS), default="json",
+                        help="json writes one document of model name -> rows, ndjson and csv one file per model")
+    parser.add_argument("--output", help="File (json) or directory (ndjson, csv) to write the generated data to")
+    parser.add_argument("--database-url",
+                        help="Also bulk load the generated ndjson output into this database, see seedLoader.py")
+    parser.add_argument("--batch-size", type=int, default=5000, help="Rows per batch when loading into the database")
+    parser.add_argument("--passwords", type=int, metavar="POOL_SIZE",
+                        help="Give generated users valid passwords, from a pool of POOL_SIZE bcrypt hashed ones (needs bcrypt)")
+    parser.add_argument("--bcrypt-cost", type=int, default=BCRYPT_COST, help="bcrypt cost of the pool's password hashes")
+    parser.add_argument("--password-cache", default=PASSWORD_CACHE,
+                        help="File the password pool is cached in across runs (default: ~/.cache/school-seed/password_pool.json)")
+    parser.add_argument("--credentials", metavar="FILE",
+                        help="Write the email, password and role of every user given a password to FILE as CSV")
+    parser.add_argument("--workload", metavar="FILE",
+                        help="Also write a load-test request trace against the generated data to FILE as NDJSON "
+                             "(needs --passwords, whose users are its clients)")
+    parser.add_argument("--workload-requests", type=int, default=10_000, help="Requests in the workload trace")
+    parser.add_argument("--workload-rate", type=float, default=50.0,
+                        help="Mean arrival rate of the workload requests, in requests per second")
+    parser.add_argument("--workload-mix", type=parse_mix, metavar="ENDPOINT=WEIGHT,...",
+                        help=f"Relative weights of the workload endpoints (default: "
+                             f"{','.join(f'{endpoint}={weight}' for endpoint, weight in WORKLOAD_MIX.items())})")
+    parser.add_argument("--workload-skew", type=float, default=1.0,
+                        help="Zipf exponent of the clients, departments and log pages requested; 0 for uniform")
+    parser.add_argument("--workload-admin", type=parse_credentials, metavar="EMAIL:PASSWORD",
+                        help="Credentials of an existing admin to send the admin requests of the workload with; "
+                             "without them, the workload has no admin requests")
+    parser.add_argument("--cache", metavar="DIR",
+                        help="Cache generated datasets in DIR, keyed by seed, counts, snapshot and schema, "
+                             "and serve repeated runs from it (needs --seed)")
+    parser.add_argument("--cache-size", type=int, default=DATASET_CACHE_MB, metavar="MB",
+                        help="Disk space the cached datasets may take before the least recently used are evicted")
+    parser.add_argument("--checkpoint", metavar="DIR",
+                        help="Checkpoint the run in DIR after every phase, removing it once the run completes (needs --seed)")
+    parser.add_argument("--resume", action="store_true",
+                        help="Pick an interrupted run up after the last phase checkpointed in --checkpoint")
+    parser.add_argument("--stats", metavar="FILE", help="Write per-phase timings, row counts and allocator probes to FILE as JSON")
+    parser.add_argument("--profile", metavar="MODEL", help="Run the phase of MODEL under cProfile and add its hottest functions to the stats")
+    parser.add_argument("--trace", metavar="MODEL",
+                        help="Run the phase of MODEL (* for every phase) under tracemalloc and add its peak and top allocations to the stats")
+    args = parser.parse_args(argv)
+    try:
+        args.counts = resolve_counts(args.scale, dict(args.count))
+    except ValueError as e:
+        parser.error(str(e))
+    if args.numpy and np is None:
+        parser.error("--numpy needs NumPy installed (pip install numpy)")
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.passwords is not None and args.passwords < 1:
+        parser.error("--passwords must be at least 1")
+    if args.credentials and not args.passwords:
+        parser.error("--credentials needs --passwords")
+    if args.workload and not args.passwords:
+        parser.error("--workload needs --passwords, so its clients can log in")
+    if args.workload_requests < 0 or args.workload_rate <= 0:
+        parser.error("--workload-requests must not be negative and --workload-rate must be positive")
+    if args.cache and args.seed is None:
+        parser.error("--cache needs --seed, as a random seed never hits the cache")
+    if args.checkpoint and args.seed is None:
+        parser.error("--checkpoint needs --seed, so the run can be resumed with it")
+    if args.resume and not args.checkpoint:
+        parser.error("--resume needs --checkpoint")
+    if args.database_url and args.format != "ndjson":
+        parser.error("--database-url needs --format ndjson, so each table can be loaded on its own")
+    if args.output is None:
+        args.output = "filler_data_output.json" if args.format == "json" else "filler_data_output"
+    return args
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    seed = new_seed() if args.seed is None else args.seed
+    fingerprint = DatasetFingerprint()
+    manifest = DeltaManifest() if args.delta else None
+    generated = dict(args.counts)
+    profiler = PhaseProfiler(args.profile, args.trace)
+    inputs = dataset_inputs(args, seed) if args.cache or args.checkpoint else None
+    cache = cached = checkpoint = None
+    if args.cache:
+        cache = DatasetCache(args.cache, args.cache_size << 20)
+        cache_key = DatasetCache.key(inputs)
+        cached = cache.load(cache_key)
+    if cached is not None:
+        tables, cache_meta = cached
+        generated.update(cache_meta.get("generated", {}))
+        if manifest is not None:
+            manifest.added, manifest.updated = cache_meta["delta"]["added"], cache_meta["delta"]["updated"]
+        print(f"Serving the dataset from cache entry {cache_key}")
+    else:
+        if args.checkpoint:
+            checkpoint = Checkpoint(args.checkpoint, inputs)
+            done = []
+            if args.resume:
+                try:
+                    done = checkpoint.load()
+                except ValueError as e:
+                    raise SystemExit(f"Cannot resume: {e}")
+            if done:
+                print(f"Resuming after {done[-1]} ({len(done)} phases done)")
+            else:
+                checkpoint.reset()
+        snapshot = SnapshotReader(args.snapshot)
+        existing_data = snapshot.load()
+        tables = iter_filler_data(existing_data, args.counts, args.workers, seed, args.numpy, manifest, snapshot,
+                                  args.distribution, checkpoint, generated)
+        tables = profiler.wrap(tables)
+        if cache is not None:
+            tables = cache.store(cache_key, tables, inputs, manifest, generated)
+    passwords = None
+    if args.passwords:
+        passwords = PasswordPool(args.passwords, args.bcrypt_cost, args.password_cache).load(args.workers)
+        tables = passwords.wrap(tables, seed)
+    workload = None
+    if args.workload:
+        workload = Workload(passwords, args.workload_requests, args.workload_rate, args.workload_mix, args.workload_skew,
+                            args.workload_admin)
+        tables = workload.wrap(tables, seed)
+    WRITERS[args.format](tables, args.output, fingerprint)
+    if checkpoint is not None:
+        checkpoint.clear()
+    write_metadata(metadata_path(args.output, args.format), seed, args.counts, fingerprint, args.snapshot, manifest,
+                   args.distribution, generated)
+    print(f"Filler data successfully saved to {args.output} (seed {seed}, fingerprint {fingerprint.digest()[:12]})")
+    if args.credentials:
+        passwords.write_credentials(args.credentials)
+        print(f"Credentials of {len(passwords.credentials)} users saved to {args.credentials}")
+    if workload is not None:
+        try:
+            workload.write(args.workload, seed)
+        except ValueError as e:
+            raise SystemExit(f"Cannot write the workload: {e}")
+        print(f"Workload of {args.workload_requests} requests from {len(workload.clients)} clients saved to {args.workload}")
+    if args.stats and cached is not None:
+        print(f"No phase stats written to {args.stats}, as nothing was generated")
+    elif args.stats:
+        summary = profiler.summary()
+        with open(args.stats, "w") as f:
+            json.dump(summary, f, indent=2)
+        print(f"Phase stats saved to {args.stats} ({summary['hottestPhase']} was the slowest phase)")
+
+    if args.database_url:
+        import seedLoader
+        connection, dialect = seedLoader.connect(args.database_url)
+        try:
+            models, _ = seedLoader.parse_schema()
+            seedLoader.load_source(connection, dialect, args.output, models, args.batch_size)
+        finally:
+            connection.close()
\ No newline at end of file
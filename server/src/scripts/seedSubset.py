@@ -0,0 +1,179 @@
+"""Cut a referentially consistent subset out of a production snapshot.
+
+Where seedDB.py generates synthetic data, this takes a ``saveDbToJson.ts``
+backup and keeps a slice of it: the root rows, the rows below them along
+SUBSET_EDGES (a department's staff, students and courses, their users,
+registrations and results, ...), and then every row those reference, so
+the subset loads without foreign key errors. ``--only`` keeps the rows
+picked below the roots to the given values of a model, e.g. to sessions:
+
+    python seedSubset.py db_backup.json --root Department.code=CSE \\
+        --only AcademicSession.name=2023/2024 --only AcademicSession.name=2024/2025 \\
+        --format ndjson --output cse_subset
+    python seedLoader.py cse_subset --database-url sqlite:///cse.db --create-tables
+
+The snapshot is streamed twice: once for the ID, foreign key and filter
+columns of every row, from which the foreign keys are indexed per table,
+and once to write out the whole rows picked. Both passes and the closure
+over the foreign keys take time linear in the size of the snapshot.
+"""
+import argparse
+import json
+
+from seedDB import SCHEMA_PATH, WRITERS, DatasetFingerprint, SnapshotReader, metadata_path
+from seedLoader import load_order, parse_schema
+
+# The foreign keys rows are picked along, from the rows picked in the models
+# they reference, per model. Other foreign keys are only followed upwards,
+# to add the rows the picked ones reference.
+SUBSET_EDGES = {
+    "Staff": ["departmentId"],
+    "Student": ["departmentId"],
+    "Course": ["departmentId"],
+    "HOD": ["departmentId", "staffId"],
+    "Dean": ["staffId"],
+    "User": ["studentId", "staffId"],
+    "AllowedCourses": ["departmentId"],
+    "AllowedCourseEntry": ["allowedCoursesId"],
+    "Registration": ["studentId"],
+    "RegistrationEntry": ["registrationId"],
+    "Result": ["studentId"],
+    "Notification": ["userId"],
+}
+
+# Small tables the server expects to find filled, kept whole in every subset
+WHOLE_TABLES = ["NextId", "SchoolSetting"]
+
+
+def parse_filter(value):
+    target, sep, expected = value.partition("=")
+    model, dot, column = target.partition(".")
+    if not sep or not dot:
+        raise argparse.ArgumentTypeError(f"expected MODEL.COLUMN=VALUE, got '{value}'")
+    return model, column, expected
+
+
+def matching_ids(rows, filters):
+    """Return the IDs of the rows matching any of the ``(column, value)`` filters, compared as strings."""
+    return {row["id"] for row in rows if any(str(row.get(column)) == expected for column, expected in filters)}
+
+
+def group_filters(filters):
+    grouped = {}
+    for model, column, expected in filters:
+        grouped.setdefault(model, []).append((column, expected))
+    return grouped
+
+
+def subset_ids(data, models, roots, only=()):
+    """Return model name -> IDs of the rows in the subset of ``data``.
+
+    ``data`` holds the rows of each model with at least their ID, foreign
+    key and filter columns. ``roots`` and ``only`` are ``(model, column,
+    value)`` filters: the rows matching a root are picked, and rows picked
+    below them must match the ``only`` filters of their model and reference
+    rows matching those of the models they reference. The rows referenced
+    by picked ones are always added, whatever the filters.
+    """
+    only = group_filters(only)
+    allowed = {model: matching_ids(data.get(model, []), filters) for model, filters in only.items()}
+    order = load_order(models)
+
+    # Per foreign key followed down: referenced ID -> referencing rows
+    indexes = {}
+    for model, columns in SUBSET_EDGES.items():
+        for column in columns:
+            index = indexes[model, column] = {}
+            for row in data.get(model, []):
+                if row.get(column) is not None:
+                    index.setdefault(row[column], []).append(row)
+
+    def permitted(model, row):
+        if model in allowed and row["id"] not in allowed[model]:
+            return False
+        return all(row.get(column) is None or row[column] in allowed[referenced]
+                   for column, referenced in models[model].foreign_keys.items() if referenced in allowed)
+
+    picked = {model: set() for model in order}
+    for model, filters in group_filters(roots).items():
+        root_ids = matching_ids(data.get(model, []), filters)
+        picked[model].update(row["id"] for row in data.get(model, []) if row["id"] in root_ids and permitted(model, row))
+    # Down from the roots, every model after the models it references
+    for model in order:
+        for column in SUBSET_EDGES.get(model, []):
+            referenced = models[model].foreign_keys[column]
+            index = indexes[model, column]
+            for referenced_id in picked[referenced]:
+                picked[model].update(row["id"] for row in index.get(referenced_id, ()) if permitted(model, row))
+    for model in WHOLE_TABLES:
+        picked[model].update(row["id"] for row in data.get(model, []))
+    # Up to everything referenced, every model before the models it references
+    for model in reversed(order):
+        foreign_keys = models[model].foreign_keys
+        if not picked[model] or not foreign_keys:
+            continue
+        for row in data.get(model, []):
+            if row["id"] in picked[model]:
+                for column, referenced in foreign_keys.items():
+                    if row.get(column) is not None:
+                        picked[referenced].add(row[column])
+    return picked
+
+
+def iter_subset(reader, picked, order):
+    """Stream the whole picked rows of a loaded SnapshotReader as ``(model, rows)`` pairs."""
+    for model in order:
+        if picked.get(model):
+            ids = picked[model]
+            yield model, (row for row in reader.rows(model) if row["id"] in ids)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Cut a referentially consistent subset out of a db_backup.json snapshot.")
+    parser.add_argument("snapshot", help="db_backup.json written by saveDbToJson.ts")
+    parser.add_argument("--root", type=parse_filter, action="append", required=True, metavar="MODEL.COLUMN=VALUE",
+                        help="Pick the rows of MODEL whose COLUMN is VALUE, and the rows below them (repeatable)")
+    parser.add_argument("--only", type=parse_filter, action="append", default=[], metavar="MODEL.COLUMN=VALUE",
+                        help="Only pick rows of, or referencing, MODEL rows whose COLUMN is VALUE below the roots; "
+                             "values given for the same MODEL are alternatives (repeatable)")
+    parser.add_argument("--schema", default=SCHEMA_PATH, help="Path to schema.prisma")
+    parser.add_argument("--format", choices=list(WRITERS), default="json",
+                        help="json writes one document of model name -> rows, ndjson and csv one file per model")
+    parser.add_argument("--output", help="File (json) or directory (ndjson, csv) to write the subset to")
+    args = parser.parse_args(argv)
+    if args.output is None:
+        args.output = "subset_output.json" if args.format == "json" else "subset_output"
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    models, _ = parse_schema(args.schema)
+    for model, column, _ in args.root + args.only:
+        if model not in models:
+            raise SystemExit(f"Unknown model '{model}' in filter on {model}.{column}")
+
+    # First pass: only the columns the closure needs
+    columns = {
+        model: ("id", *spec.foreign_keys, *(column for filter_model, column, _ in args.root + args.only if filter_model == model))
+        for model, spec in models.items()
+    }
+    reader = SnapshotReader(args.snapshot, columns)
+    picked = subset_ids(reader.load(), models, args.root, args.only)
+
+    # Second pass: the whole rows
+    fingerprint = DatasetFingerprint()
+    WRITERS[args.format](iter_subset(reader, picked, load_order(models)), args.output, fingerprint)
+    with open(metadata_path(args.output, args.format), "w") as f:
+        json.dump({
+            "snapshot": args.snapshot,
+            "roots": [f"{model}.{column}={value}" for model, column, value in args.root],
+            "only": [f"{model}.{column}={value}" for model, column, value in args.only],
+            "rows": fingerprint.rows,
+            "fingerprint": fingerprint.digest(),
+        }, f, indent=2)
+    print(f"Subset of {sum(fingerprint.rows.values())} rows saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()